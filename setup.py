@@ -1,8 +1,10 @@
 #!/usr/bin/env python
 import os
 import re
+import sys
 
 from setuptools import find_packages, setup
+from setuptools.command.build_py import build_py
 
 NAME = 'Wibtex'
 VERSION = '1.0.2'
@@ -13,7 +15,8 @@ AUTHOR_EMAIL = 'jpb64@nau.edu'
 URL = 'https://github.com/jbredeme/Wibtex'
 LICENSE = 'MIT License'
 PACKAGES = find_packages()
-DATA_FILES = [('config', ['config/styles.json']), ('config', ['config/log.properties'])]
+DATA_FILES = [('config', ['config/styles.json']), ('config', ['config/log.properties']),
+              ('config', ['config/required_fields.json'])]
 
 INSTALL_REQUIRES = ['lxml>=3.7.2', 'bs4', 'Bibtexparser>=0.6.2', 'Jinja2>=2.9']
 
@@ -29,6 +32,17 @@ CLASSIFIERS = [
     'Programming Language :: Python :: 3.6.1',
 ]
 
+
+class BuildPy(build_py):
+    '''Generates the precompiled RosettaStone table before building'''
+
+    def run(self):
+        sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+        import map as rosetta
+        rosetta.write_tables()
+        build_py.run(self)
+
+
 params = {
     'name':             NAME,
     'version':          VERSION,
@@ -42,6 +56,8 @@ params = {
     'install_requires': INSTALL_REQUIRES,
     'classifiers':      CLASSIFIERS,
     'data_files':       DATA_FILES,
+    'package_data':     {'src': ['rosetta_table.pickle']},
+    'cmdclass':         {'build_py': BuildPy},
 }
 
 setup(**params)
\ No newline at end of file
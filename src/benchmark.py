@@ -0,0 +1,387 @@
+#!/usr/bin/python
+
+############################################################
+# @file   benchmark.py
+# @brief  script to time the WibTeX RMS on large inputs
+#
+# @author agent
+# @date   October 18, 2026
+############################################################
+
+################################################
+# Import Python Modules
+################################################
+
+import os
+import re
+import sys
+import copy
+import time
+import tempfile
+import tracemalloc
+import logger
+import wibtex_parser
+import bib_index
+import native
+import names
+import style
+import map
+
+################################################
+# Constants
+################################################
+
+# The BibTeX database every benchmark is scaled up from
+DEMO_BIB = 'demo_data/complete_bib.bib'
+
+# Matches the citation key of a raw BibTeX entry
+ENTRY_KEY = re.compile(r'(@\w+\s*[{(]\s*)([^,\s]*)')
+
+# Worker counts compared by the parallel benchmark
+WORKER_COUNTS = (1, 2, 4, 8)
+
+# Author names passed to the filter benchmarks
+AUTHORS = (
+    'Duso, Charles', 'Bredemeier, Jarid', 'Knuth, Donald Ervin',
+    'Lamport, Leslie', 'van Rossum, Guido', 'Hopper, Grace Murray',
+    'Ritchie, Dennis M.', 'Thompson, Ken', 'Liskov, Barbara',
+    'Dijkstra, Edsger W.')
+
+# Arguments of every style filter, by case name
+FILTER_CASES = {
+    'add_chars': ('. ',),
+    'add_to_front': ('In ',),
+    'authors_acm': (),
+    'authors_apa': (),
+    'authors_ccsc': (),
+    'font': ('28', '#4286F4'),
+    'get_last': (),
+    'wrap': (')',),
+    'wrap_html': ('i',),
+}
+
+################################################
+# Function Definitions
+################################################
+
+
+def scale_database(entries, count):
+    '''
+    Replicates a list of raw BibTeX entries until it holds count entries
+
+    @param  entries the raw BibTeX entries to replicate
+    @param  count   the number of entries to generate
+    @return         a list of count uniquely keyed BibTeX entries
+    '''
+
+    scaled = []
+
+    for index in range(0, count):
+        entry = copy.deepcopy(entries[index % len(entries)])
+        entry['ID'] = entry.get('ID', '') + '_' + str(index)
+        scaled.append(entry)
+
+    return scaled
+
+
+def copy_value(value):
+    '''
+    Copies a raw field value into new string objects, as a parser
+    creates them, so that equal values are not already shared
+
+    @param  value the raw field value
+    @return       the copied value
+    '''
+
+    if isinstance(value, list):
+        return [copy_value(item) for item in value]
+
+    return value.encode('utf-8').decode('utf-8')
+
+
+def write_scaled_bib(count, path):
+    '''
+    Writes a BibTeX file of count uniquely keyed raw entries replicated
+    from the demo database
+
+    @param count the number of entries to write
+    @param path  the file to write
+    '''
+
+    with open(DEMO_BIB) as f:
+        blocks = wibtex_parser.split_entries(f.read())
+
+    entries = [
+        block for kind, block in blocks
+        if kind not in bib_index.NON_ENTRY_TYPES]
+
+    with open(path, 'w') as f:
+        for index in range(0, count):
+            f.write(ENTRY_KEY.sub(
+                r'\g<1>\g<2>_' + str(index),
+                entries[index % len(entries)], count=1))
+
+
+def traced(function, *args):
+    '''
+    Measures the memory still allocated by the result of a single call
+    to a function
+
+    @param  function the function to call
+    @return          the result and the bytes allocated for it
+    '''
+
+    tracemalloc.start()
+
+    try:
+        result = function(*args)
+        allocated = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+    return result, allocated
+
+
+def timed(function, *args):
+    '''
+    Times a single call to a function
+
+    @param  function the function to call
+    @return          the elapsed time in seconds
+    '''
+
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def bench_normalize(count):
+    '''
+    Times normalize_entries on a scaled database
+
+    @param count the number of BibTeX entries to normalize
+    '''
+
+    log = logger.SimpleLogger()
+    entries = scale_database(wibtex_parser.read_entries(DEMO_BIB, log), count)
+
+    single_pass = timed(wibtex_parser.normalize_entries, entries)
+
+    print("normalize %d entries" % count)
+    print("    single pass:  %.3fs" % single_pass)
+
+
+def bench_latex(count):
+    '''
+    Times the TeX translator on accent-dense and pathological fields of
+    growing length; the time per character should stay flat
+
+    @param count the number of times the largest field repeats its text
+    '''
+
+    convert = map.get_rosetta()
+
+    fields = {
+        'accents': "\\'{e}\\\"{o}",
+        'unclosed': "\\x{",
+    }
+
+    for name in sorted(fields):
+        size = 1000
+        while size <= count:
+            elapsed = timed(convert.translate, fields[name] * size)
+            print("latex %-8s %8d repeats: %.4fs" % (name, size, elapsed))
+            size *= 10
+
+
+def bench_parallel(count):
+    '''
+    Times parsing a scaled database with a growing number of workers
+
+    @param count the number of BibTeX entries to parse
+    '''
+
+    handle, path = tempfile.mkstemp(suffix='.bib')
+    os.close(handle)
+
+    try:
+        write_scaled_bib(count, path)
+
+        print("parallel parse of %d entries" % count)
+        expected = None
+
+        for workers in WORKER_COUNTS:
+
+            start = time.perf_counter()
+            result = wibtex_parser.parse(
+                path, logger.RecordingLogger(), workers=workers)
+            elapsed = time.perf_counter() - start
+
+            if expected is None:
+                expected = result
+
+            print("    %d workers: %.3fs%s" % (
+                workers, elapsed,
+                '' if result == expected else ' (output differs)'))
+
+    finally:
+        os.remove(path)
+
+
+def bench_validate(count):
+    '''
+    Times validating a scaled database with a growing number of workers
+
+    @param count the number of BibTeX entries to validate
+    '''
+
+    log = logger.RecordingLogger()
+    entries = scale_database(wibtex_parser.read_entries(DEMO_BIB, log), count)
+
+    print("validate %d entries" % count)
+
+    for workers in WORKER_COUNTS:
+        elapsed = timed(
+            wibtex_parser.validate_entries, entries,
+            logger.RecordingLogger(), True, workers)
+        print("    %d workers: %.3fs" % (workers, elapsed))
+
+
+def bench_memory(count):
+    '''
+    Compares the memory held by a scaled database of plain dictionaries
+    against one of compact LazyEntry objects
+
+    @param count the number of BibTeX entries to hold
+    '''
+
+    log = logger.RecordingLogger()
+    entries = scale_database(wibtex_parser.read_entries(DEMO_BIB, log), count)
+
+    def copy_entries():
+        return [
+            dict((copy_value(key), copy_value(value))
+                 for key, value in entry.items())
+            for entry in entries]
+
+    plain, plain_size = traced(copy_entries)
+    del plain
+
+    compact, compact_size = traced(
+        lambda: wibtex_parser.make_lazy(copy_entries()))
+
+    print("memory of %d entries" % count)
+    print("    dictionaries: %.1f MB" % (plain_size / 1048576.0))
+    print("    lazy entries: %.1f MB (%d shapes)" % (
+        compact_size / 1048576.0, len(wibtex_parser.LazyEntry.shapes)))
+
+
+def bench_render(count):
+    '''
+    Compares the per-reference cost of rendering every template of every
+    style through Jinja2 against the native compiler
+
+    @param count the number of references to render per template
+    '''
+
+    entries = list(wibtex_parser.parse(
+        DEMO_BIB, logger.RecordingLogger()).values())
+    entries = [entries[index % len(entries)] for index in range(0, count)]
+
+    environment = style.construct_env()
+    registry = style.get_registry()
+
+    print("render %d references per template" % count)
+
+    for style_form in registry.get_valid_styles(logger.RecordingLogger()):
+
+        sources = style.get_template_sources(
+            registry.get_style_data(style_form, logger.RecordingLogger()))
+
+        jinja_time = 0.0
+        native_time = 0.0
+        fallback = 0
+        differs = False
+
+        for source in sources:
+
+            jinja_template = environment.from_string(source)
+            native_template = native.compile_native(environment, source)
+
+            if native_template is None:
+                fallback += 1
+                continue
+
+            jinja_time += timed(
+                lambda: [jinja_template.render(entry) for entry in entries])
+            native_time += timed(
+                lambda: [native_template.render(entry) for entry in entries])
+
+            differs = differs or any(
+                jinja_template.render(entry) != native_template.render(entry)
+                for entry in entries)
+
+        renders = float(count * max(len(sources) - fallback, 1))
+
+        print("    %-5s jinja2: %.2fus  native: %.2fus%s%s" % (
+            style_form, jinja_time / renders * 1e6,
+            native_time / renders * 1e6,
+            ' (%d left to Jinja2)' % fallback if fallback else '',
+            ' (output differs)' if differs else ''))
+
+
+def bench_filters(count):
+    '''
+    Times every style filter on a string, a number and author lists of
+    growing length, to track regressions in the cost of a single call
+
+    @param count the number of calls to time per filter and value
+    '''
+
+    values = [
+        ('string', 'Journal of Computing Sciences in Colleges'),
+        ('number', 2017),
+        ('1 author', names.get_names(AUTHORS[:1])),
+        ('3 authors', names.get_names(AUTHORS[:3])),
+        ('10 authors', names.get_names(AUTHORS)),
+    ]
+
+    print("filters, %d calls each" % count)
+
+    for name in sorted(FILTER_CASES):
+
+        function = style.construct_env().filters[name]
+        arguments = FILTER_CASES[name]
+
+        for label, value in values:
+
+            def call():
+                for index in range(0, count):
+                    function(value, *arguments)
+
+            print("    %-13s %-10s %.3fus" % (
+                name, label, timed(call) / count * 1e6))
+
+
+BENCHMARKS = {
+    'filters': bench_filters,
+    'latex': bench_latex,
+    'memory': bench_memory,
+    'normalize': bench_normalize,
+    'parallel': bench_parallel,
+    'render': bench_render,
+    'validate': bench_validate,
+}
+
+################################################
+# Execute Benchmarks
+################################################
+
+if __name__ == '__main__':
+
+    # Input is of the form: benchmark.py [name] [count]
+    selected = sys.argv[1:2] or sorted(BENCHMARKS)
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 100000
+
+    for name in selected:
+        BENCHMARKS[name](count)
@@ -0,0 +1,291 @@
+############################################################
+# @file   bib_index.py
+# @brief  module to index the entries of BibTeX databases
+#
+# @author agent
+# @date   October 18, 2026
+############################################################
+
+################################################
+# Import Python Modules
+################################################
+
+import os
+import re
+import json
+import mmap
+import locale
+import hashlib
+import cache
+
+################################################
+# Constants
+################################################
+
+# Version of the index format, increment whenever it changes
+INDEX_VERSION = 3
+
+# Suffix of the index file stored next to a BibTeX database
+INDEX_SUFFIX = '.idx'
+
+# Start of an @type{ or @type( block at the beginning of a line
+ENTRY_START = re.compile(r'^[ \t]*@[ \t]*(\w+)[ \t]*[{(]', re.M)
+
+# Type and citation key of every @type{key, within a raw block
+ENTRY_KEY = re.compile(r'@\s*(\w+)\s*[{(]\s*([^,\s]*)')
+
+# The same patterns, for scanning raw bytes
+ENTRY_START_BYTES = re.compile(ENTRY_START.pattern.encode('ascii'), re.M)
+ENTRY_KEY_BYTES = re.compile(ENTRY_KEY.pattern.encode('ascii'))
+
+# Block types which do not hold a BibTeX entry
+NON_ENTRY_TYPES = ('string', 'preamble', 'comment')
+
+# Encoding of BibTeX databases, the one open() reads them with elsewhere
+ENCODING = locale.getpreferredencoding(False)
+
+################################################
+# Class Definitions
+################################################
+
+
+class BibIndex:
+
+    def __init__(self, path):
+        '''
+        Opens a BibTeX database through its index of the byte range of
+        every block, building or updating the index as needed. The index
+        is kept in a file next to the database and trusted while the
+        size and modification time of the database are unchanged. When
+        they change but the indexed bytes are intact, as when entries
+        are appended, only the new bytes are scanned.
+
+        @param path a BibTeX database file path
+        '''
+
+        self.path = path
+        self.index_path = path + INDEX_SUFFIX
+
+        self.file = open(path, 'rb')
+        stat = os.fstat(self.file.fileno())
+
+        # A zero-length file cannot be mapped
+        if stat.st_size:
+            self.data = mmap.mmap(
+                self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self.data = b''
+
+        self.size = stat.st_size
+        self.mtime = stat.st_mtime
+
+        # Digest of the whole database, as of its last scan
+        self.digest = None
+
+        self.blocks = []
+        self.keys = {}
+        self.lowered = {}
+
+        self.load()
+
+    def close(self):
+        '''
+        Releases the mapped database
+        '''
+
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def get_digest(self, size):
+        '''
+        Computes the digest of the first bytes of the database
+
+        @param  size the number of bytes to digest
+        @return      the digest
+        '''
+
+        view = memoryview(self.data)
+
+        try:
+            return hashlib.sha1(view[:size]).hexdigest()
+        finally:
+            view.release()
+
+    def load(self):
+        '''
+        Reads the index file, rescanning whatever part of the database
+        the index no longer describes
+        '''
+
+        try:
+            with open(self.index_path, 'r') as f:
+                stored = json.load(f)
+
+            # Keys decoded with another encoding may no longer match
+            if (stored['version'] != INDEX_VERSION or
+                    stored['encoding'] != ENCODING):
+                raise ValueError
+
+        except (IOError, ValueError, KeyError):
+            stored = None
+
+        if stored is None or stored['size'] > self.size:
+            self.scan(0, [])
+
+        elif stored['size'] == self.size and stored['mtime'] == self.mtime:
+            self.blocks = stored['blocks']
+            self.digest = stored['digest']
+
+        elif self.get_digest(stored['size']) == stored['digest']:
+
+            # Rescan from the last indexed block, which any appended
+            # text would extend
+            blocks = stored['blocks']
+            start = blocks[-1][2] if blocks else 0
+            self.scan(start, blocks[:-1])
+
+        else:
+            self.scan(0, [])
+
+        for position in range(0, len(self.blocks)):
+            for key in self.blocks[position][1]:
+                self.keys.setdefault(key, []).append(position)
+                self.lowered.setdefault(key.lower(), key)
+
+    def scan(self, start, blocks):
+        '''
+        Indexes every block from an offset to the end of the database,
+        then saves the index. A block runs up to the next line starting
+        with @ and is indexed under the key of every entry within it.
+
+        @param start  the offset of the first block to scan
+        @param blocks the blocks already indexed before that offset
+        '''
+
+        for kind, keys, block_start, block_end in scan_blocks(
+                self.data, start):
+            blocks.append([kind, keys, block_start])
+
+        self.blocks = blocks
+        self.digest = self.get_digest(self.size)
+
+        stored = {
+            'version': INDEX_VERSION,
+            'encoding': ENCODING,
+            'size': self.size,
+            'mtime': self.mtime,
+            'digest': self.digest,
+            'blocks': blocks,
+        }
+
+        # An unwritable folder is not fatal
+        cache.write_atomically(
+            self.index_path, lambda f: json.dump(stored, f), binary=False)
+
+    def get_block(self, position):
+        '''
+        Decodes the raw text of a single block
+
+        @param  position the position of the block in the index
+        @return          the raw BibTeX text of the block
+        '''
+
+        start = self.blocks[position][2]
+
+        if position + 1 < len(self.blocks):
+            end = self.blocks[position + 1][2]
+        else:
+            end = self.size
+
+        return self.data[start:end].decode(ENCODING)
+
+    def find_blocks(self, key):
+        '''
+        Finds the blocks of an entry by its citation key, falling back
+        to a case-insensitive match
+
+        @param  key the citation key
+        @return     a list of (position, raw text) tuples in file order
+        '''
+
+        positions = self.keys.get(key)
+
+        if positions is None:
+            positions = self.keys.get(self.lowered.get(key.lower()), [])
+
+        return [(position, self.get_block(position))
+                for position in positions]
+
+    def get_strings(self):
+        '''
+        Decodes the raw text of every @string definition
+
+        @return the concatenated @string blocks
+        '''
+
+        return ''.join(
+            self.get_block(position)
+            for position in range(0, len(self.blocks))
+            if self.blocks[position][0] == 'string')
+
+################################################
+# Function Definitions
+################################################
+
+
+def scan_blocks(data, start=0):
+    '''
+    Splits raw BibTeX text or bytes into blocks, each starting where a
+    line starts with @type{ or @type( and running up to the next one,
+    along with the citation key of every entry within each block
+
+    @param  data  the raw BibTeX text, or its bytes in ENCODING
+    @param  start the offset to scan from
+    @return       a list of (type, keys, start, end) tuples with
+                  lower-case types
+    '''
+
+    if isinstance(data, str):
+        entry_start, entry_key = ENTRY_START, ENTRY_KEY
+    else:
+        entry_start, entry_key = ENTRY_START_BYTES, ENTRY_KEY_BYTES
+
+    def decode(value):
+        if isinstance(value, str):
+            return value
+        return value.decode(ENCODING, 'replace')
+
+    blocks = []
+    matches = list(entry_start.finditer(data, start))
+
+    for index in range(0, len(matches)):
+
+        block_start = matches[index].start()
+
+        if index + 1 < len(matches):
+            block_end = matches[index + 1].start()
+        else:
+            block_end = len(data)
+
+        keys = []
+        for match in entry_key.finditer(data, block_start, block_end):
+
+            if decode(match.group(1)).lower() in NON_ENTRY_TYPES:
+                continue
+
+            key = decode(match.group(2))
+            if key not in keys:
+                keys.append(key)
+
+        kind = decode(matches[index].group(1)).lower()
+        blocks.append((kind, keys, block_start, block_end))
+
+    return blocks
@@ -0,0 +1,205 @@
+############################################################
+# @file   cache.py
+# @brief  module to persist results between runs
+#
+# @author agent
+# @date   October 18, 2026
+############################################################
+
+################################################
+# Import Python Modules
+################################################
+
+import os
+import pickle
+import hashlib
+import tempfile
+
+################################################
+# Constants
+################################################
+
+# Root folder of every on-disk cache
+CACHE_DIR = '../cache'
+
+# Default bound on the size of a single cache folder, in bytes
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+
+# Suffix of completed cache entries
+ENTRY_SUFFIX = '.cache'
+
+################################################
+# Class Definitions
+################################################
+
+
+class DiskCache:
+
+    def __init__(self, name, max_size=DEFAULT_MAX_SIZE, root=CACHE_DIR):
+        '''
+        Constructs a size-bounded, least-recently-used cache of pickled
+        values stored one per file. Entries are written to a temporary
+        file and renamed into place, so any number of processes may share
+        a cache folder; a reader sees either a whole entry or none.
+
+        @param name     the sub-folder of the cache root to store entries in
+        @param max_size the size in bytes above which old entries are evicted
+        @param root     the cache root folder
+        '''
+
+        self.directory = os.path.join(root, name)
+        self.max_size = max_size
+
+        try:
+            os.makedirs(self.directory)
+        except OSError:
+            pass
+
+    @staticmethod
+    def make_key(*parts):
+        '''
+        Builds a cache key from any number of values
+
+        @return a digest of the string form of every value
+        '''
+
+        digest = hashlib.sha1()
+
+        for part in parts:
+            digest.update(repr(part).encode('utf-8'))
+            digest.update(b'\0')
+
+        return digest.hexdigest()
+
+    def get_path(self, key):
+        '''
+        Returns the file holding a cache entry
+
+        @param  key the cache key
+        @return     the path of the entry
+        '''
+
+        return os.path.join(self.directory, key + ENTRY_SUFFIX)
+
+    def get(self, key, default=None):
+        '''
+        Reads a value from the cache, marking it as recently used
+
+        @param  key     the cache key
+        @param  default the value to return when the key is not cached
+        @return         the cached value
+        '''
+
+        path = self.get_path(key)
+
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+
+            # The modification time orders entries for eviction
+            os.utime(path, None)
+
+        # Entries written by an older version may no longer unpickle
+        except (IOError, OSError, EOFError, pickle.UnpicklingError,
+                AttributeError, ImportError, TypeError, ValueError):
+            return default
+
+        return value
+
+    def put(self, key, value, evict=True):
+        '''
+        Writes a value to the cache, evicting old entries if the cache
+        grows beyond its bound
+
+        @param key   the cache key
+        @param value the value to store, which must be picklable
+        @param evict whether to evict old entries now; a caller writing
+                     many values may evict once after the last
+        '''
+
+        written = write_atomically(
+            self.get_path(key),
+            lambda f: pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL))
+
+        if written and evict:
+            self.evict()
+
+    def evict(self):
+        '''
+        Removes the least recently used entries until the cache fits
+        within its bound
+        '''
+
+        entries = []
+        total = 0
+
+        for name in os.listdir(self.directory):
+
+            if not name.endswith(ENTRY_SUFFIX):
+                continue
+
+            # Another process may evict the same entry at any time
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+
+            entries.append((stat.st_mtime, stat.st_size, name))
+            total += stat.st_size
+
+        for mtime, size, name in sorted(entries):
+
+            if total <= self.max_size:
+                break
+
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+            total -= size
+
+################################################
+# Function Definitions
+################################################
+
+
+def write_atomically(path, write, binary=True):
+    '''
+    Replaces a file through a temporary file in the same folder renamed
+    into place, so a reader sees either the old file or the whole new
+    one. A failed write leaves no temporary file behind; I/O errors are
+    not fatal, any other error is raised again.
+
+    @param  path   the file to replace
+    @param  write  a function writing the contents to an open file
+    @param  binary whether to open the file in binary mode
+    @return        whether the file was replaced
+    '''
+
+    try:
+        handle, temp_path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(path)))
+    except (IOError, OSError):
+        return False
+
+    try:
+        with os.fdopen(handle, 'wb' if binary else 'w') as f:
+            write(f)
+
+        os.replace(temp_path, path)
+
+    except BaseException as error:
+
+        # Never leave a partly written file behind
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+
+        if isinstance(error, (IOError, OSError)):
+            return False
+
+        raise
+
+    return True
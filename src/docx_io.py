@@ -184,6 +184,22 @@ class Document:
         return bibs, xml
 
 
+    # This function collects the bibtex database reference keys cited by a document so that only those entries
+    # need to be read from the database.
+    #
+    # @pram bibs is the python dictionary of bibliographies returned by get_dict_xml.
+    # @return a set containing every cited bib_key.
+    #
+    def get_bib_keys(self, bibs):
+        keys = set()
+
+        for key, val in bibs.items():
+            for key2, val2 in val['citations'].items():
+                keys.add(val2['bib_key'])
+
+        return keys
+
+
     # This is a utility function that prints the contents of a Wibtex document dictionary
     #
     # @pram dictionary is a reference variable to a dictionary object.
@@ -65,3 +65,29 @@ class SimpleLogger:
         file.write(str(data_string))
 
         file.close()
+
+
+class RecordingLogger:
+
+    def __init__(self, log=None):
+        '''
+        Constructs a logger that keeps every message it is given,
+        passing each on to another logger if one is supplied
+
+        @param log the logger to pass messages on to
+        '''
+
+        self.log = log
+        self.messages = []
+
+    def log_data(self, data_string):
+        '''
+        Records a message and passes it on
+
+        @param data_string the data to log
+        '''
+
+        self.messages.append(data_string)
+
+        if self.log is not None:
+            self.log.log_data(data_string)
@@ -4,6 +4,7 @@
 # Copyright © 2017 All rights reserved 
 #
 
+import cache
 import logger
 import style
 import wibtex_parser
@@ -25,16 +26,25 @@ def execute(input_bib, input_doc, style_form, output_doc, log):
     cite_data = {}  #=> the formatted reference data to insert in the document
     xml = ""  		#=> the document string
 
-    bib_data = wibtex_parser.parse(input_bib, log)	#=> read BibTeX Database (wibtex_parser.py)
-	
     docx = docx_io.Document(input_doc)				#=> read in the document
 	
     xml = (docx.get_xml())							#=> extract XML
 	
     bib_tags, xml = docx.get_dict_xml(xml)			#=> extract BibTeX markup
 
+    cited_keys = docx.get_bib_keys(bib_tags)		#=> only the cited entries are read from the database
+    parse_cache = cache.DiskCache('parse')			#=> reuse databases parsed by earlier runs
+
+    style_data = style.read_style_file(style_form, log)	#=> only the fields the style reads are kept
+    fields = style.get_style_fields(style_data) if style_data else None
+
+    bib_data = wibtex_parser.parse(input_bib, log, parse_cache, keys=cited_keys, use_index=True, fields=fields)	#=> read BibTeX Database (wibtex_parser.py)
+
+    render_cache = None								#=> cache.DiskCache('render') reuses references rendered by earlier runs
+    database = wibtex_parser.get_database_version(input_bib, True) if render_cache else None
+
     # Generate Reference Data (style.py)
-    cite_data = style.get_reference_data(style_form, bib_tags, bib_data, log)
+    cite_data = style.get_reference_data(style_form, bib_tags, bib_data, log, cache=render_cache, database=database)
 
 	
     # Write to Word Document (docx_io.py)
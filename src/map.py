@@ -6,12 +6,53 @@
 # @date   May 3, 2017
 ############################################################
 
+################################################
+# Import Python Modules
+################################################
+
+import os
+import pickle
+import hashlib
+
+################################################
+# Constants
+################################################
+
+# File generated by write_tables holding the finished tables
+TABLE_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'rosetta_table.pickle')
+
+# Process-wide tables and RosettaStone, loaded on first use
+TABLES = None
+ROSETTA = None
+
+################################################
+# Class Definitions
+################################################
+
 
 class RosettaStone:
 
     def __init__(self):
+        '''
+        Constructs a converter over the process-wide encoding tables;
+        the tables are shared and must not be modified
+        '''
+
+        (self.unicode_to_latex,
+         self.latex_to_unicode,
+         self.trie,
+         self.version) = get_tables()
+
+    @staticmethod
+    def build_tables():
+        '''
+        Builds the encoding tables from their source mapping
+
+        @return a tuple of the unicode-to-latex and latex-to-unicode tables
+        '''
 
-        self.unicode_to_latex = {
+        unicode_to_latex = {
             u"\u0020": "\\space ",
             u"\u0023": "\\#",
             u"\u0024": "\\textdollar ",
@@ -2370,21 +2411,18 @@ class RosettaStone:
             u"\uD7FF": "\\mathtt{9}",
         }
 
-        for key in self.unicode_to_latex:
-            self.unicode_to_latex[key] = (
-                self
-                .unicode_to_latex[key]
-                .replace("\\", "\\\\"))
-
-            self.unicode_to_latex[key] = (
-                self
-                .unicode_to_latex[key]
+        for key in unicode_to_latex:
+            unicode_to_latex[key] = (
+                unicode_to_latex[key]
+                .replace("\\", "\\\\")
                 .replace(" ", ""))
 
-        self.latex_to_unicode = {
-            v: k for k, v in self.unicode_to_latex.items()
+        latex_to_unicode = {
+            v: k for k, v in unicode_to_latex.items()
             }
 
+        return unicode_to_latex, latex_to_unicode
+
     def get_encoding(self, to_convert):
 
         if self.latex_to_unicode.get(to_convert):
@@ -2402,3 +2440,221 @@ class RosettaStone:
         else:
 
             return to_convert
+
+    @staticmethod
+    def build_trie(latex_to_unicode):
+        '''
+        Builds a character trie of every TeX command in a table; each
+        node maps a character to its child node and the empty string to
+        the Unicode character spelled by the path to that node
+
+        @param  latex_to_unicode the latex-to-unicode table
+        @return                  the root node of the trie
+        '''
+
+        trie = {}
+
+        for latex, unicode in latex_to_unicode.items():
+
+            # Only commands can be introduced by a backslash
+            if not latex.startswith("\\\\"):
+                continue
+
+            node = trie
+            for char in latex.replace("\\\\", "\\"):
+                node = node.setdefault(char, {})
+            node[""] = unicode
+
+        return trie
+
+    def translate(self, text):
+        '''
+        Converts every TeX command in a string to Unicode in a single
+        left-to-right scan. Each backslash starts a walk down the trie
+        that takes the longest command which does not end in the middle
+        of a control word; the walk is bounded by the longest command in
+        the table, so the scan is linear in the length of the string
+        whatever its content. Unknown commands are kept as they are.
+
+        @param  text the string to convert
+        @return      the converted string
+        '''
+
+        trie = self.trie
+        length = len(text)
+        pieces = []
+        last = 0
+
+        position = text.find("\\")
+        while position != -1:
+
+            node = trie
+            match = None
+            end = cursor = position
+
+            # Walk the trie for the longest command at this backslash
+            while cursor < length:
+                node = node.get(text[cursor])
+                if node is None:
+                    break
+                cursor += 1
+
+                # A control word cannot be followed by another letter
+                if "" in node and not (
+                        cursor < length and
+                        text[cursor].isalpha() and
+                        text[cursor - 1].isalpha()):
+                    match = node[""]
+                    end = cursor
+
+            # An accent symbol may take its letter without braces, as
+            # in {\"o}; prefer the braced form over the bare accent
+            if (end - position <= 2 and position + 2 < length and
+                    not text[position + 1].isalpha() and
+                    not text[position + 2].isspace() and
+                    text[position + 2] not in "{}\\"):
+
+                node = trie
+                for char in ("\\", text[position + 1], "{",
+                             text[position + 2], "}"):
+                    node = node.get(char)
+                    if node is None:
+                        break
+
+                if node is not None and "" in node:
+                    match = node[""]
+                    end = position + 3
+
+            if match is None:
+                position = text.find("\\", position + 1)
+                continue
+
+            pieces.append(text[last:position])
+            pieces.append(match)
+            last = end
+            position = text.find("\\", end)
+
+        pieces.append(text[last:])
+
+        return "".join(pieces)
+
+
+################################################
+# Function Definitions
+################################################
+
+
+def table_version(unicode_to_latex):
+    '''
+    Computes the version of a set of encoding tables
+
+    @param  unicode_to_latex the unicode-to-latex table
+    @return                  a digest identifying the table contents
+    '''
+
+    return hashlib.sha1(
+        repr(sorted(unicode_to_latex.items())).encode('utf-8')).hexdigest()
+
+
+def source_digest():
+    '''
+    Computes a digest of this module's source, used to detect a stale
+    generated table file
+
+    @return the digest, or None if the source cannot be read
+    '''
+
+    try:
+        with open(os.path.splitext(__file__)[0] + '.py', 'rb') as f:
+            return hashlib.sha1(f.read()).hexdigest()
+    except IOError:
+        return None
+
+
+def load_tables():
+    '''
+    Loads the encoding tables from the generated table file, building
+    them from source if the file is missing or out of date
+
+    @return a tuple of the unicode-to-latex table, the latex-to-unicode
+            table, the command trie and the table version
+    '''
+
+    try:
+        with open(TABLE_FILE, 'rb') as f:
+            table = pickle.load(f)
+
+        digest = source_digest()
+        if digest is None or digest == table['digest']:
+            return (table['unicode_to_latex'],
+                    table['latex_to_unicode'],
+                    table['trie'],
+                    table['version'])
+
+    except (IOError, EOFError, KeyError, pickle.UnpicklingError):
+        pass
+
+    unicode_to_latex, latex_to_unicode = RosettaStone.build_tables()
+
+    return (unicode_to_latex,
+            latex_to_unicode,
+            RosettaStone.build_trie(latex_to_unicode),
+            table_version(unicode_to_latex))
+
+
+def get_tables():
+    '''
+    Returns the process-wide encoding tables, loading them on first use
+
+    @return a tuple of the unicode-to-latex table, the latex-to-unicode
+            table, the command trie and the table version
+    '''
+
+    global TABLES
+
+    if TABLES is None:
+        TABLES = load_tables()
+
+    return TABLES
+
+
+def get_rosetta():
+    '''
+    Returns the process-wide RosettaStone
+
+    @return the shared RosettaStone
+    '''
+
+    global ROSETTA
+
+    if ROSETTA is None:
+        ROSETTA = RosettaStone()
+
+    return ROSETTA
+
+
+def write_tables(path=TABLE_FILE):
+    '''
+    Generates the table file loaded by load_tables; run at build time
+    by setup.py, or by hand with "python map.py"
+
+    @param path the file to write
+    '''
+
+    unicode_to_latex, latex_to_unicode = RosettaStone.build_tables()
+
+    table = {
+        'digest': source_digest(),
+        'version': table_version(unicode_to_latex),
+        'unicode_to_latex': unicode_to_latex,
+        'latex_to_unicode': latex_to_unicode,
+        'trie': RosettaStone.build_trie(latex_to_unicode),
+    }
+
+    # Protocol 4 is readable by every supported version of Python
+    with open(path, 'wb') as f:
+        pickle.dump(table, f, protocol=4)
+
+
+if __name__ == '__main__':
+    write_tables()
@@ -0,0 +1,171 @@
+############################################################
+# @file   names.py
+# @brief  module to split author names into their parts
+#
+# @author agent
+# @date   October 18, 2026
+############################################################
+
+################################################
+# Import Python Modules
+################################################
+
+import re
+
+################################################
+# Constants
+################################################
+
+# A word followed by a comma, as in the "Last, " of "Last, First"
+COMMA_WORD = re.compile(r'\w+,\s+')
+
+# The letter starting each word after the first
+INITIAL = re.compile(r'\s(\w)')
+
+# A single word
+WORD = re.compile(r'\w+')
+
+# Every name split so far, by the text it was split from
+NAMES = {}
+
+################################################
+# Class Definitions
+################################################
+
+
+class Name(str):
+
+    def __new__(cls, text):
+        '''
+        Constructs an author name which is still the string it was
+        written as, split into its BibTeX parts:
+
+            first    - the given names
+            von      - the lowercase particles before the last name
+            last     - the last name
+            jr       - the lineage, such as Jr. or III
+            initials - a tuple of the first letter of each given name
+
+        along with the forms style filters print:
+
+            short       - the first word of the name
+            abbreviated - the "Last, F.M." form of the name, or only its
+                          last name when it has no initials
+            abbreviable - whether abbreviated holds any initials
+
+        @param text the name as written in a BibTeX author field
+        '''
+
+        name = str.__new__(cls, text)
+
+        name.first, name.von, name.last, name.jr = split_name(text)
+        name.initials = tuple(word[0] for word in name.first.split())
+
+        words = WORD.findall(text)
+        comma_words = COMMA_WORD.findall(text)
+        letters = INITIAL.findall(text)
+
+        name.short = words[0] if words else ''
+        name.abbreviable = bool(comma_words and letters)
+
+        if not comma_words:
+            name.abbreviated = name.short
+        elif not letters:
+            name.abbreviated = comma_words[0].split(',')[0]
+        else:
+            name.abbreviated = comma_words[0] + ''.join(
+                letter + '.' for letter in letters)
+
+        return name
+
+################################################
+# Function Definitions
+################################################
+
+
+def split_name(text):
+    '''
+    Splits a name written as "First von Last", "von Last, First" or
+    "von Last, Jr, First" into its parts
+
+    @param  text the name
+    @return      a tuple of the first, von, last and jr parts
+    '''
+
+    parts = [part.strip() for part in text.split(',')]
+
+    first = []
+    von = []
+    jr = ''
+
+    if len(parts) == 1:
+
+        words = parts[0].split()
+        if not words:
+            return ('', '', '', '')
+
+        # The last word is always part of the last name
+        rest = words[:-1]
+        last = words[-1:]
+
+        lower = [
+            index for index in range(0, len(rest))
+            if rest[index][:1].islower()]
+
+        if lower:
+            first = rest[:lower[0]]
+            von = rest[lower[0]:lower[-1] + 1]
+            last = rest[lower[-1] + 1:] + last
+        else:
+            first = rest
+
+    else:
+
+        words = parts[0].split()
+
+        if len(parts) == 2:
+            first = parts[1].split()
+        else:
+            jr = parts[1]
+            first = ', '.join(parts[2:]).split()
+
+        # Leading lowercase words are particles, but never the last one
+        count = 0
+        while count < len(words) - 1 and words[count][:1].islower():
+            count += 1
+
+        von = words[:count]
+        last = words[count:]
+
+    return (' '.join(first), ' '.join(von), ' '.join(last), jr)
+
+
+def get_name(text):
+    '''
+    Returns the Name of a string, splitting each distinct string once
+
+    @param  text an author name
+    @return      the Name
+    '''
+
+    if isinstance(text, Name):
+        return text
+
+    text = str(text)
+    name = NAMES.get(text)
+
+    if name is None:
+        name = NAMES[text] = Name(text)
+
+    return name
+
+
+def get_names(values):
+    '''
+    Returns the Name of every string in a list
+
+    @param  values a list of author names
+    @return        a list of Names
+    '''
+
+    return [get_name(value) for value in values]
@@ -0,0 +1,387 @@
+############################################################
+# @file   native.py
+# @brief  module to compile style templates into native
+#         Python functions, bypassing the Jinja2 runtime
+#
+# @author agent
+# @date   October 18, 2026
+############################################################
+
+################################################
+# Import Python Modules
+################################################
+
+import collections.abc
+from jinja2 import nodes, TemplateSyntaxError
+
+################################################
+# Constants
+################################################
+
+# Types of constants written into a compiled function by their repr
+CONSTANT_TYPES = (str, int, float, bool, type(None))
+
+# Environment attributes holding the functions a compiled template uses
+FUNCTION_KINDS = ('filters', 'tests')
+
+# Python operators of the Jinja2 boolean nodes
+BOOLEAN_OPERATORS = {
+    nodes.And: 'and',
+    nodes.Or: 'or',
+}
+
+################################################
+# Class Definitions
+################################################
+
+
+class Unsupported(Exception):
+    '''
+    Raised for template syntax outside of the subset the native
+    compiler understands
+    '''
+
+    pass
+
+
+class NativeTemplate:
+
+    def __init__(self, source, function):
+        '''
+        Constructs a template rendered by a plain Python function, with
+        the render method of a Jinja2 template
+
+        @param source   the template source
+        @param function the function rendering a mapping of variables
+        '''
+
+        self.source = source
+        self.function = function
+
+    def render(self, *args, **kwargs):
+        '''
+        Renders the template; a single mapping is read in place rather
+        than copied, so its unused fields are never looked up
+
+        @return the rendered string
+        '''
+
+        if (len(args) == 1 and not kwargs and
+                isinstance(args[0], collections.abc.Mapping)):
+            return self.function(args[0])
+
+        return self.function(dict(*args, **kwargs))
+
+
+class Compiler:
+
+    def __init__(self, environment):
+        '''
+        Translates the syntax tree of a template into the source of a
+        Python function which renders it exactly as Jinja2 would:
+        text, variables, constants, filters, tests, conditional
+        expressions, boolean operators and if statements
+
+        @param environment the Jinja2 environment whose filters, tests,
+                           globals and undefined type templates use
+        '''
+
+        check_environment(environment)
+
+        self.environment = environment
+
+        # Variable name -> local name in the compiled function
+        self.variables = {}
+
+        # Global name -> [kind, name] of the filter or test it refers to
+        self.references = {}
+
+        self.lines = []
+
+    def write(self, depth, line):
+        '''
+        Adds a line to the body of the compiled function
+
+        @param depth the indentation depth
+        @param line  the line
+        '''
+
+        self.lines.append('    ' * depth + line)
+
+    def get_function(self, kind, name):
+        '''
+        Refers to a filter or test which takes no context or environment
+
+        @param  kind the kind of function, 'filters' or 'tests'
+        @param  name the filter or test name
+        @return      the name the function is bound to
+        '''
+
+        get_function(self.environment, kind, name)
+
+        bound = 'f_%d' % len(self.references)
+        self.references[bound] = [kind, name]
+
+        return bound
+
+    def expression(self, node):
+        '''
+        Translates an expression node
+
+        @param  node the Jinja2 node
+        @return      the Python expression
+        '''
+
+        if isinstance(node, nodes.Const):
+
+            if not isinstance(node.value, CONSTANT_TYPES):
+                raise Unsupported(node)
+
+            return repr(node.value)
+
+        if isinstance(node, nodes.Name):
+
+            if node.ctx != 'load':
+                raise Unsupported(node)
+
+            if node.name not in self.variables:
+                self.variables[node.name] = 'l_%d' % len(self.variables)
+
+            return self.variables[node.name]
+
+        if isinstance(node, (nodes.Filter, nodes.Test)):
+
+            if (node.node is None or node.dyn_args is not None or
+                    node.dyn_kwargs is not None):
+                raise Unsupported(node)
+
+            if isinstance(node, nodes.Filter):
+                function = self.get_function('filters', node.name)
+            else:
+                function = self.get_function('tests', node.name)
+
+            arguments = [self.expression(node.node)]
+            arguments.extend(self.expression(arg) for arg in node.args)
+            arguments.extend(
+                '%s=%s' % (keyword.key, self.expression(keyword.value))
+                for keyword in node.kwargs)
+
+            return '%s(%s)' % (function, ', '.join(arguments))
+
+        if isinstance(node, nodes.CondExpr):
+
+            # Without an else, Jinja2 renders an undefined value
+            if node.expr2 is None:
+                raise Unsupported(node)
+
+            return '(%s if %s else %s)' % (
+                self.expression(node.expr1), self.expression(node.test),
+                self.expression(node.expr2))
+
+        if type(node) in BOOLEAN_OPERATORS:
+            return '(%s %s %s)' % (
+                self.expression(node.left), BOOLEAN_OPERATORS[type(node)],
+                self.expression(node.right))
+
+        if isinstance(node, nodes.Not):
+            return '(not %s)' % self.expression(node.node)
+
+        raise Unsupported(node)
+
+    def statements(self, body, depth):
+        '''
+        Translates a list of statement nodes, appending to the output
+
+        @param body  the Jinja2 nodes
+        @param depth the indentation depth
+        '''
+
+        if not body:
+            self.write(depth, 'pass')
+
+        for node in body:
+
+            if isinstance(node, nodes.Output):
+
+                pieces = []
+
+                for child in node.nodes:
+                    if isinstance(child, nodes.TemplateData):
+                        pieces.append(repr(child.data))
+                    else:
+                        pieces.append('str(%s)' % self.expression(child))
+
+                self.write(depth, 'out.extend((%s,))' % ', '.join(pieces))
+
+            elif isinstance(node, nodes.If):
+
+                self.write(depth, 'if %s:' % self.expression(node.test))
+                self.statements(node.body, depth + 1)
+
+                for branch in node.elif_:
+                    self.write(
+                        depth, 'elif %s:' % self.expression(branch.test))
+                    self.statements(branch.body, depth + 1)
+
+                if node.else_:
+                    self.write(depth, 'else:')
+                    self.statements(node.else_, depth + 1)
+
+            else:
+                raise Unsupported(node)
+
+    def translate(self, source):
+        '''
+        Translates a template into the source of a Python function,
+        which refers to the functions in the references of the compiler
+
+        @param  source the template source
+        @return        the source of the function
+        '''
+
+        tree = self.environment.parse(source)
+        self.statements(tree.body, 1)
+
+        # Every variable is resolved once, up front, as Jinja2 does
+        lines = ['def render(context):']
+        for name, local in self.variables.items():
+            lines.append('    %s = context[%r] if %r in context else '
+                         'resolve(%r)' % (local, name, name, name))
+        lines.append('    out = []')
+        lines.extend(self.lines)
+        lines.append("    return ''.join(out)")
+
+        return '\n'.join(lines)
+
+################################################
+# Function Definitions
+################################################
+
+
+def check_environment(environment):
+    '''
+    Checks that templates of an environment render as plain text, with
+    no escaping, asynchronous rendering or finalizing of values
+
+    @param environment the Jinja2 environment
+    '''
+
+    if (environment.autoescape is not False or environment.is_async or
+            environment.finalize is not None):
+        raise Unsupported('environment')
+
+
+def get_function(environment, kind, name):
+    '''
+    Finds a filter or test which takes no context or environment
+
+    @param  environment the Jinja2 environment
+    @param  kind        the kind of function, 'filters' or 'tests'
+    @param  name        the filter or test name
+    @return             the function
+    '''
+
+    function = getattr(environment, kind).get(name)
+
+    if function is None or getattr(function, 'jinja_pass_arg', None):
+        raise Unsupported(name)
+
+    return function
+
+
+def build_function(environment, code, references):
+    '''
+    Builds the function of a translated template, binding the filters
+    and tests it refers to from the environment
+
+    @param  environment the Jinja2 environment of the template
+    @param  code        the compiled code defining the function
+    @param  references  a dictionary mapping the global names of the
+                        function to the [kind, name] of their function
+    @return             the function rendering a mapping of variables
+    '''
+
+    check_environment(environment)
+
+    def resolve(name):
+
+        # Variables missing from the mapping are looked up, as Jinja2
+        # does, among the environment globals
+        if name in environment.globals:
+            return environment.globals[name]
+
+        return environment.undefined(name=name)
+
+    namespace = {'resolve': resolve}
+
+    for bound, (kind, name) in references.items():
+
+        if kind not in FUNCTION_KINDS:
+            raise Unsupported(kind)
+
+        namespace[bound] = get_function(environment, kind, name)
+
+    exec(code, namespace)
+
+    return namespace['render']
+
+
+def translate_native(environment, source):
+    '''
+    Translates a template into the compiled code of a native function,
+    which may be stored with marshal and built later by load_native
+
+    @param  environment the Jinja2 environment of the template
+    @param  source      the template source
+    @return             a tuple of the compiled code and the functions it
+                        refers to, or None if Jinja2 must compile the
+                        template instead
+    '''
+
+    try:
+        compiler = Compiler(environment)
+        code = compiler.translate(source)
+    except (Unsupported, TemplateSyntaxError):
+        return None
+
+    return (compile(code, '<native template>', 'exec'),
+            compiler.references)
+
+
+def load_native(environment, source, code, references):
+    '''
+    Builds a NativeTemplate from the output of translate_native, without
+    parsing the template again
+
+    @param  environment the Jinja2 environment of the template
+    @param  source      the template source
+    @param  code        the compiled code defining the function
+    @param  references  the functions the function refers to
+    @return             the NativeTemplate, or None if the environment no
+                        longer provides those functions
+    '''
+
+    try:
+        return NativeTemplate(
+            source, build_function(environment, code, references))
+    except Unsupported:
+        return None
+
+
+def compile_native(environment, source):
+    '''
+    Compiles a template into a NativeTemplate when it only uses syntax
+    the native compiler understands
+
+    @param  environment the Jinja2 environment of the template
+    @param  source      the template source
+    @return             the NativeTemplate, or None if Jinja2 must
+                        compile the template instead
+    '''
+
+    translated = translate_native(environment, source)
+
+    if translated is None:
+        return None
+
+    return load_native(environment, source, *translated)
@@ -11,10 +11,59 @@
 # Import Python Modules
 ################################################
 
+import os
 import re
+import sys
+import glob
 import json
+import marshal
+import hashlib
+import compileall
+import collections
+import collections.abc
+import functools
+import jinja2
 import logger
-from jinja2 import Template, Environment, BaseLoader
+import names
+import native
+from jinja2 import Template, Environment, BaseLoader, DictLoader, \
+    ModuleLoader, TemplateNotFound, meta
+
+################################################
+# Constants
+################################################
+
+# The last name of a "Last, First" author name
+LAST_NAME = re.compile('^(.+?),')
+
+# Number of compiled templates kept by compile_template
+TEMPLATE_CACHE_SIZE = 256
+
+# The shared Jinja2 environment, constructed on first use
+ENVIRONMENT = None
+
+# The style file in the config folder
+STYLE_FILE = "../config/styles.json"
+
+# The shared StyleRegistry, constructed on first use
+REGISTRY = None
+
+# Version of rendered references, increment whenever a filter changes
+RENDER_VERSION = 1
+
+# Whether templates the native compiler understands bypass Jinja2
+NATIVE_TEMPLATES = True
+
+# Version of the compiled style bundle, increment whenever it or the
+# native compiler changes
+BUNDLE_VERSION = 2
+
+# File of the compiled style bundle holding the code of native functions,
+# stored with marshal as the bundle is specific to one Python version
+NATIVE_BUNDLE_FILE = 'native.marshal'
+
+# Folder of the compiled style bundles
+BUNDLE_ROOT = '../cache/styles'
 
 ################################################
 # Function Definitions - Jinja2 Pipe & Filters
@@ -30,28 +79,24 @@ def font(value, size, color=None):
     @return         the wrapped data
     '''
 
-    if color:
-        if isinstance(value, list):
-            data = ""
-            for item in value:
-                data += '<font color="' + color + '" size="' + size + '">' + str(item) + '</font>'
-            return data
-
-        elif isinstance(value, str):
-            return '<font size="' + size + '" color="' + color + '">' + value + '</font>'
+    if isinstance(value, list):
+
+        if color:
+            start = '<font color="' + color + '" size="' + size + '">'
         else:
-            return '<font size="' + size + '" color="' + color + '">' + str(value) + '</font>'
+            start = '<font size="' + size + '">'
+
+        return ''.join([
+            start + (item if isinstance(item, str) else str(item)) + '</font>'
+            for item in value])
+
+    if not isinstance(value, str):
+        value = str(value)
+
+    if color:
+        return '<font size="' + size + '" color="' + color + '">' + value + '</font>'
     else:
-        if isinstance(value, list):
-            data = ""
-            for item in value:
-                data += '<font size="' + size + '">' + str(item) + '</font>'
-            return data
-
-        elif isinstance(value, str):
-            return '<font size="' + size + '">' + value + '</font>'
-        else:
-            return '<font size="' + size + '">' + str(value) + '</font>'
+        return '<font size="' + size + '">' + value + '</font>'
 
 
 def wrap_html(value, wrapper):
@@ -63,16 +108,18 @@ def wrap_html(value, wrapper):
     @return         the wrapped data
     '''
 
-    if isinstance(value, list):
-        data = ""
-        for item in value:
-            data += "<" + wrapper + ">" + str(item) + "</" + wrapper + ">"
-        return data
-
-    elif isinstance(value, str):
+    if isinstance(value, str):
         return "<" + wrapper + ">" + value + "</" + wrapper + ">"
-    else:
-        return "<" + wrapper + ">" + str(value) + "</" + wrapper + ">"
+
+    elif isinstance(value, list):
+        start = "<" + wrapper + ">"
+        end = "</" + wrapper + ">"
+
+        return ''.join([
+            start + (item if isinstance(item, str) else str(item)) + end
+            for item in value])
+
+    return "<" + wrapper + ">" + str(value) + "</" + wrapper + ">"
 
 
 def add_chars(value, char):
@@ -86,56 +133,35 @@ def add_chars(value, char):
 
     if isinstance(value, str):
         return value + char
+
     elif isinstance(value, list):
-        data = ""
-        for item in value:
-            data += str(item) + char
-        return data
-    else:
-        return str(value) + char
+        return ''.join([
+            (item if isinstance(item, str) else str(item)) + char
+            for item in value])
+
+    return str(value) + char
 
 
 def wrap(value, char):
     '''
-    Wraps Jinja2 contextual data (specialized for braces/brackets)
+    Wraps Jinja2 contextual data (specialized for braces/brackets); a
+    list is wrapped as a whole, in its string form
 
     @param  value   the data to filter
     @param  char    the values to wrap
     @return         the modified data
     '''
 
-    if isinstance(value, str):
-
-        if char is ')' or char is '(':
-            return '(' + value + ')'
-
-        elif char is ']' or char is '[':
-            return '[' + value + ']'
+    if not isinstance(value, str):
+        value = str(value)
 
-        return char + value + char
+    if char == ')' or char == '(':
+        return '(' + value + ')'
 
-    elif isinstance(value, str):
-
-        data = ""
-
-        for item in value:
-            if char is ')' or char is '(':
-                data += '(' + str(item) + ')'
-            elif char is ']' or char is '[':
-                data += '[' + str(item) + ']'
-            else:
-                data += char + str(item) + char
-        return data
-
-    else:
+    elif char == ']' or char == '[':
+        return '[' + value + ']'
 
-        if char is ')' or char is '(':
-            return '(' + str(value) + ')'
-
-        elif char is ']' or char is '[':
-            return '[' + str(value) + ']'
-
-        return char + str(value) + char
+    return char + value + char
 
 
 def add_to_front(value, char):
@@ -149,13 +175,25 @@ def add_to_front(value, char):
 
     if isinstance(value, str):
         return char + value
+
     elif isinstance(value, list):
-        data = ""
-        for item in value:
-            data += char + str(item)
-        return data
-    else:
-        return char + str(value)
+        return ''.join([
+            char + (item if isinstance(item, str) else str(item))
+            for item in value])
+
+    return char + str(value)
+
+
+def join_authors(authors):
+    '''
+    Joins two or more author names as "A, B, C and D "
+
+    @param  authors a list of formatted author names
+    @return         the joined names
+    '''
+
+    return ', '.join(authors[:-2] + [
+        authors[-2] + ' and ' + authors[-1]]) + ' '
 
 
 def authors_ccsc(value):
@@ -168,38 +206,15 @@ def authors_ccsc(value):
 
     if isinstance(value, list):
 
-        f_half = ""  # First half of an author list
-        s_half = ""  # Second half of an author list
-
         if len(value) <= 1:
-            f_half = re.findall('\w+,\s+', str(value[0]))
-            s_half = re.findall('\s(\w)', str(value[0]))
-            name = re.findall('\w+', str(value[0]))
-
-            if not f_half:
-                return name[0] + ' '
-            elif not s_half:
-                return f_half[0].split(',')[0] + ' '
-            else:
-                return str(name[0]) + ", "
-            return ''
-
-        else:
-            string = ""
-
-            for item in value:
-                f_half = re.findall('\w+,\s+', str(item))
-                s_half = re.findall('\s(\w)', str(item))
-                name = re.findall('\w+', str(item))
+            name = names.get_name(value[0])
 
-                if not s_half:
-                    string += name[0] + ", "
-                elif not s_half:
-                    string += f_half.split(',')[0] + ", "
-                else:
-                    string += str(name[0]) + ", "
+            if name.abbreviable:
+                return name.short + ", "
+            else:
+                return name.abbreviated + ' '
 
-            return string
+        return ''.join([names.get_name(item).short + ", " for item in value])
 
     elif isinstance(value, str):
         return value + ', '
@@ -216,483 +231,680 @@ def authors_acm(value):
     @return         the modified data
     '''
 
-    f_half = ""
-    s_half = ""
-
     if isinstance(value, list):
 
         # If list of authors is one
         if len(value) <= 1:
+            return names.get_name(value[0]).abbreviated + ' '
 
-            f_half = re.findall('\w+,\s+', str(value[0]))
-            s_half = re.findall('\s(\w)', str(value[0]))
-            name = re.findall('\w+', str(value[0]))
+        return join_authors(
+            [names.get_name(item).abbreviated for item in value])
 
-            # If no last name exists return name
-            if not f_half:
-                return name[0] + ' '
+    return value
 
-            # If the initials don't exist
-            elif not s_half:
-                return f_half[0].split(',')[0] + ' '
 
-            # If initials exist, format them
-            else:
-                out = f_half[0]
-                for item in s_half:
-                    out += item + '.'
-                return out + ' '
+def authors_apa(value):
+    '''
+    Adds APA author format to Jinja2 contextual data
+
+    @param  value   the data to filter
+    @return         the modified data
+    '''
+
+    # For a list of authors
+    if isinstance(value, list):
 
-        # If list of authors is two
-        elif len(value) == 2:
-            first = ""
-            second = ""
+        # If we have a single author
+        if len(value) <= 1:
+            return names.get_name(value[0]).abbreviated + ' '
 
-            f_half = re.findall('\w+,\s+', str(value[0]))
-            s_half = re.findall('\s(\w)', str(value[0]))
-            name = re.findall('\w+', str(value[0]))
+        # With more than 7 authors, the first six and the last are listed
+        elif len(value) > 7:
+            return ''.join(
+                [names.get_name(item).abbreviated + ', '
+                 for item in value[:6]] +
+                [' ... ', names.get_name(value[-1]).abbreviated, ' '])
 
-            # If no last name exists return name
-            if not f_half:
-                first = name[0]
+        return join_authors(
+            [names.get_name(item).abbreviated for item in value])
 
-            # If the initials don't exist
-            elif not s_half:
-                first = f_half[0].split(',')[0]
+    elif isinstance(value, str):
+        return value + ', '
 
-            # If initials exist, format them
-            else:
-                first = f_half[0]
-                for item in s_half:
-                    first += item + '.'
+    else:
+        return str(value) + ', '
 
-            f_half = re.findall('\w+,\s+', str(value[1]))
-            s_half = re.findall('\s(\w)', str(value[1]))
-            name = re.findall('\w+', str(value[1]))
 
-            # If no last name exists return name
-            if not f_half:
-                second = name[0]
+def get_last(value):
+    '''
+    Extracts the last name of an author from Jinja2 contextual data
 
-            # If the initials don't exist
-            elif not s_half:
-                second = f_half[0].split(',')[0]
+    @param  value   the data to filter
+    @return         the modified data
+    '''
 
-            # If initials exist, format them
-            else:
-                second = f_half[0]
-                for item in s_half:
-                    second += item + '.'
+    if isinstance(value, list):
+        value = str(value[0])
 
-            return first + ' and ' + second + ' '
+    elif not isinstance(value, str):
+        return str(value)
 
-        # List of 3 or more authors
-        else:
+    match = LAST_NAME.match(value)
 
-            out = ""
-            temp = ""
-
-            # For each author
-            for index in range(0, len(value)):
-
-                f_half = re.findall('\w+,\s+', str(value[index]))
-                s_half = re.findall('\s(\w)', str(value[index]))
-                name = re.findall('\w+', str(value[index]))
-
-                # If second to last author
-                if index == len(value) - 2:
-                    if not f_half:
-                        temp = name[0] + ' and '
-                    elif not s_half:
-                        temp = f_half[0].split(',')[0] + ' and '
-                    else:
-                        temp = f_half[0]
-                        for item in s_half:
-                            temp += item + '.'
-                        temp += ' and '
-                    out += temp
-
-                # If last author
-                elif index == len(value) - 1:
-                    if not f_half:
-                        temp = name[0]
-                    elif not s_half:
-                        temp = f_half[0].split(',')[0]
-                    else:
-                        temp = f_half[0]
-                        for item in s_half:
-                            temp += item + '.'
-                    out += temp + ' '
-
-                # If author not last nor second to last
-                else:
-                    if not f_half:
-                        temp = name[0]
-                    elif not s_half:
-                        temp = f_half[0].split(',')[0]
-                    else:
-                        temp = f_half[0]
-                        for item in s_half:
-                            temp += item + '.'
-                    out += temp + ', '
-
-            return out
+    if match is not None:
+        return match.group(1)
 
     return value
 
 
-def authors_apa(value):
+def get_bundle_path():
     '''
-    Adds APA author format to Jinja2 contextual data
+    Returns the folder of the compiled style bundle; modules compiled by
+    another version of Jinja2 or Python are kept in another folder
 
-    @param  value   the data to filter
-    @return         the modified data
+    @return the path of the bundle
     '''
 
-    f_half = ""
-    s_half = ""
+    return os.path.join(BUNDLE_ROOT, 'v%d-jinja%s-py%d%d' % (
+        BUNDLE_VERSION, jinja2.__version__,
+        sys.version_info[0], sys.version_info[1]))
 
-    # For a list of authors
-    if isinstance(value, list):
 
-        # If we have a single author
-        if len(value) <= 1:
-            f_half = re.findall('\w+,\s+', str(value[0]))
-            s_half = re.findall('\s(\w)', str(value[0]))
-            name = re.findall('\w+', str(value[0]))
+def get_template_name(source):
+    '''
+    Names a template in the compiled style bundle by its source, so an
+    edited template never loads the module of its old source
 
-            # If no last name
-            if not f_half:
-                return name[0] + ' '
+    @param  source the template source
+    @return        the template name
+    '''
 
-            # If no initials
-            elif not s_half:
-                return f_half[0].split(',')[0] + ' '
+    return hashlib.sha1(source.encode('utf-8')).hexdigest()
 
-            # If initials and last name
-            else:
-                out = f_half[0]
-                for item in s_half:
-                    out += item + '.'
 
-                return out + ' '
+def read_native_bundle(bundle_path):
+    '''
+    Reads the native functions of the compiled style bundle
 
-        # If we have two authors
-        elif len(value) == 2:
-            first = ""
-            second = ""
+    @param  bundle_path the compiled style bundle
+    @return             a dictionary mapping template names to the code
+                        and references of their native function
+    '''
 
-            f_half = re.findall('\w+,\s+', str(value[0]))
-            s_half = re.findall('\s(\w)', str(value[0]))
-            name = re.findall('\w+', str(value[0]))
+    try:
+        with open(os.path.join(bundle_path, NATIVE_BUNDLE_FILE), 'rb') as f:
+            return marshal.load(f)
+    except (IOError, ValueError, EOFError, TypeError):
+        return {}
 
-            # If no last name
-            if not f_half:
-                first = name[0]
 
-            # If no initials
-            elif not s_half:
-                first = f_half[0].split(',')[0]
+def construct_env(bundle_path=None):
+    '''
+    Constructs a Jinja2 environment with all filter functions added,
+    loading templates and native functions from the compiled style
+    bundle when present
 
-            # If initials and last name
-            else:
-                first = f_half[0]
-                for item in s_half:
-                    first += item + '.'
+    @param  bundle_path the compiled style bundle, or None for the default
+    @return             the Jinja2 custom environment
+    '''
 
-            f_half = re.findall('\w+,\s+', str(value[1]))
-            s_half = re.findall('\s(\w)', str(value[1]))
-            name = re.findall('\w+', str(value[1]))
+    if bundle_path is None:
+        bundle_path = get_bundle_path()
 
-            # If no last name
-            if not f_half:
-                second = name[0]
+    if os.path.isdir(bundle_path):
+        environment = Environment(loader=ModuleLoader(bundle_path))
+        environment.extend(native_bundle=read_native_bundle(bundle_path))
+    else:
+        environment = Environment(loader=BaseLoader)
+        environment.extend(native_bundle={})
 
-            # If no initials
-            elif not s_half:
-                second = f_half[0].split(',')[0]
+    environment.filters['wrap_html'] = wrap_html
+    environment.filters['add_chars'] = add_chars
+    environment.filters['wrap'] = wrap
+    environment.filters['font'] = font
+    environment.filters['add_to_front'] = add_to_front
+    environment.filters['authors_ccsc'] = authors_ccsc
+    environment.filters['authors_acm'] = authors_acm
+    environment.filters['authors_apa'] = authors_apa
+    environment.filters['get_last'] = get_last
 
-            # If initials and last name
-            else:
-                second = f_half[0]
-                for item in s_half:
-                    second += item + '.'
+    return environment
 
-            return first + ' and ' + second + ' '
 
-        # If number of authors greater than 7
-        elif len(value) > 7:
+def get_environment():
+    '''
+    Returns the Jinja2 environment shared by every style, constructing
+    it once
 
-            out = ""
-            temp = ""
+    @return the Jinja2 custom environment
+    '''
 
-            # For each author
-            for index in range(0, len(value)):
+    global ENVIRONMENT
 
-                f_half = re.findall('\w+,\s+', str(value[index]))
-                s_half = re.findall('\s(\w)', str(value[index]))
-                name = re.findall('\w+', str(value[index]))
+    if ENVIRONMENT is None:
+        ENVIRONMENT = construct_env()
 
-                # If we are at the sixth author
-                if index == 6:
-                    out += ' ... '
+    return ENVIRONMENT
 
-                # If we are between the first and last authors
-                elif index > 6 and index <= len(value) - 2:
-                    continue
 
-                # If we are the second to last author
-                elif index == len(value) - 1:
+@functools.lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def compile_template(environment, source, use_native=False):
+    '''
+    Compiles a template, reusing the result for the same source; Jinja2
+    templates are immutable and safe to render any number of times.
+    Templates in the compiled style bundle are loaded from it instead,
+    native functions included, so they are never parsed again.
+
+    @param  environment the Jinja2 environment to compile with
+    @param  source      the template source
+    @param  use_native  whether to compile the template into a native
+                        function when it only uses the syntax of styles
+    @return             the compiled template
+    '''
 
-                    # If no last name
-                    if not f_half:
-                        temp = name[0]
+    if use_native:
 
-                    # If no initials
-                    elif not s_half:
-                        temp = f_half[0].split(',')[0]
+        bundled = getattr(environment, 'native_bundle', {}).get(
+            get_template_name(source))
 
-                    # If initials and last name
-                    else:
-                        temp = f_half[0]
-                        for item in s_half:
-                            temp += item + '.'
-                    out += temp + ' '
+        if bundled is not None:
+            template = native.load_native(environment, source, *bundled)
+        else:
+            template = native.compile_native(environment, source)
 
-                # If we are the first author
-                else:
+        if template is not None:
+            return template
 
-                    # If no last name
-                    if not f_half:
-                        temp = name[0]
+    if isinstance(environment.loader, ModuleLoader):
+        try:
+            return environment.get_template(get_template_name(source))
+        except TemplateNotFound:
+            pass
 
-                    # If no initials
-                    elif not s_half:
-                        temp = f_half[0].split(',')[0]
+    return environment.from_string(source)
 
-                    # If initials and last name
-                    else:
-                        temp = f_half[0]
-                        for item in s_half:
-                            temp += item + '.'
-                    out += temp + ', '
 
-            return out
+def get_template_sources(style_data):
+    '''
+    Lists the source of every template of a style
 
-        # If we have > 2 and < 7 authors
-        else:
+    @param  style_data a dictionary containing style data
+    @return            a list of template sources
+    '''
+
+    sources = [
+        style_data.get('in_text_style', {}).get('template'),
+        style_data.get('title', {}).get('template'),
+        style_data.get('default_style')]
+
+    for alt_style in (style_data.get('extended_styles') or {}).values():
+        sources.append(alt_style.get('template'))
+
+    return [source for source in sources if isinstance(source, str)]
+
+
+def compile_bundle(style_files=(STYLE_FILE,), bundle_path=None):
+    '''
+    Precompiles every template of every style into Python modules, and
+    those into bytecode, stored in the compiled style bundle along with
+    the native function of every template the native compiler
+    understands. Templates which fail to compile are left out and
+    compiled when used instead.
+
+    @param  style_files the style files to compile
+    @param  bundle_path the compiled style bundle, or None for the default
+    @return             the number of templates compiled
+    '''
+
+    if bundle_path is None:
+        bundle_path = get_bundle_path()
+
+    sources = {}
+
+    for style_file in style_files:
+        with open(style_file) as f:
+            for style_data in json.load(f).values():
+                for source in get_template_sources(style_data):
+                    sources[get_template_name(source)] = source
+
+    environment = construct_env(bundle_path='')
+    environment.loader = DictLoader(sources)
+    environment.compile_templates(bundle_path, zip=None)
+
+    compileall.compile_dir(bundle_path, quiet=1)
+
+    translated = {}
+    for name, source in sources.items():
+        result = native.translate_native(environment, source)
+        if result is not None:
+            translated[name] = result
+
+    with open(os.path.join(bundle_path, NATIVE_BUNDLE_FILE), 'wb') as f:
+        marshal.dump(translated, f)
+
+    return len(sources)
+
+################################################
+# Class Definitions
+################################################
+
+
+class Style:
+
+    def __init__(self, style_data, environment=None, use_native=None):
+        '''
+        Compiles every template of a style once: the in-text, title,
+        default and extended templates
+
+        @param style_data  a dictionary containing style data
+        @param environment the Jinja2 environment to compile with
+        @param use_native  whether to compile templates into native
+                           functions, or None for NATIVE_TEMPLATES
+        '''
+
+        if environment is None:
+            environment = get_environment()
+
+        if use_native is None:
+            use_native = NATIVE_TEMPLATES
+
+        self.data = style_data
+        self.environment = environment
+        self.order = style_data.get('order')
+
+        in_text = style_data.get('in_text_style')
+        self.token = in_text.get('index')
+        self.in_text = compile_template(
+            environment, in_text.get('template'), use_native)
+
+        title = style_data.get('title')
+        self.title_key = title.get('key')
+        self.title = compile_template(
+            environment, title.get('template'), use_native)
+
+        self.default = compile_template(
+            environment, style_data.get('default_style'), use_native)
+        self.default_version = get_template_name(
+            style_data.get('default_style'))
+
+        self.extended = {}
+        extended_versions = {}
+        extended_styles = style_data.get('extended_styles') or {}
+        for name, alt_style in extended_styles.items():
+            self.extended[name] = compile_template(
+                environment, alt_style.get('template'), use_native)
+            extended_versions[name] = get_template_name(
+                alt_style.get('template'))
+
+        self.dispatch = Style.build_dispatch(extended_styles)
+
+        # Compiled template of every entry type with an extended style
+        self.templates = dict(
+            (entrytype, self.extended[name])
+            for entrytype, name in self.dispatch.items())
+
+        # Digest of the source of those templates
+        self.versions = dict(
+            (entrytype, extended_versions[name])
+            for entrytype, name in self.dispatch.items())
+
+    @staticmethod
+    def build_dispatch(extended_styles):
+        '''
+        Resolves which extended style formats each entry type. A style
+        preferring the type wins over one supporting it; among several,
+        the last listed wins. Types with neither use the default style.
+
+        @param  extended_styles the extended styles of a style
+        @return                 a dictionary mapping entry types to the
+                                name of their extended style
+        '''
+
+        supported = {}
+        preferred = {}
+
+        for name, alt_style in extended_styles.items():
+
+            for entrytype in alt_style.get('supported') or []:
+                supported[entrytype] = name
+
+            for entrytype in alt_style.get('preferred') or []:
+                preferred[entrytype] = name
+
+        dispatch = supported
+        dispatch.update(preferred)
+
+        return dispatch
+
+    def get_template(self, entrytype):
+        '''
+        Returns the compiled template formatting an entry type
+
+        @param  entrytype the BibTeX entry type
+        @return           the compiled Jinja2 template
+        '''
+
+        return self.templates.get(entrytype, self.default)
+
+    def get_version(self, entrytype):
+        '''
+        Returns the version of the template formatting an entry type,
+        which changes whenever its source does
+
+        @param  entrytype the BibTeX entry type
+        @return           the digest of the template source
+        '''
+
+        return self.versions.get(entrytype, self.default_version)
+
+
+class RenderContext(collections.abc.Mapping):
+
+    __slots__ = ('values', 'entry')
+
+    def __init__(self, values, entry):
+        '''
+        Constructs a read-only view of a database entry with per-document
+        values, such as the citation number, laid over it. Unlike a
+        ChainMap, a lookup costs at most two dictionary probes.
+
+        @param values a dictionary of per-document values
+        @param entry  a BibTeX database entry
+        '''
+
+        self.values = values
+        self.entry = entry
+
+    def __getitem__(self, key):
+
+        if key in self.values:
+            return self.values[key]
+
+        return self.entry[key]
+
+    def __contains__(self, key):
+        return key in self.values or key in self.entry
+
+    def __iter__(self):
+
+        for key in self.values:
+            yield key
+
+        for key in self.entry:
+            if key not in self.values:
+                yield key
 
-            out = ""
-            temp = ""
+    def __len__(self):
+        return sum(1 for key in self)
 
-            for index in range(0, len(value)):
+    def copy(self):
 
-                f_half = re.findall('\w+,\s+', str(value[index]))
-                s_half = re.findall('\s(\w)', str(value[index]))
-                name = re.findall('\w+', str(value[index]))
+        # Jinja2 copies the variables of a template which failed to
+        # render to report them, reading every field
+        return dict(self)
 
-                if index == len(value) - 2:
+    def __repr__(self):
+        return 'RenderContext(%r, %r)' % (self.values, self.entry)
 
-                    # If no last name
-                    if not f_half:
-                        temp = name[0] + ' and '
 
-                    # If no initials
-                    elif not s_half:
-                        temp = f_half[0].split(',')[0] + ' and '
+class StyleRegistry:
 
-                    # If initials and last name
-                    else:
-                        temp = f_half[0]
-                        for item in s_half:
-                            temp += item + '.'
-                        temp += ' and '
-                    out += temp
+    def __init__(self, style_file=STYLE_FILE, style_dirs=()):
+        '''
+        Loads, validates and compiles styles once per process. Before
+        each use the style files are checked for changes: a file is only
+        read again when its modification time changes, and only parsed
+        again when its contents change too.
 
-                elif index == len(value) - 1:
+        @param style_file the main style file
+        @param style_dirs folders of additional style files, whose styles
+                          replace those of the same name in earlier files
+        '''
 
-                    # If no last name
-                    if not f_half:
-                        temp = name[0]
+        self.style_file = style_file
+        self.style_dirs = list(style_dirs)
 
-                    # If no initials
-                    elif not s_half:
-                        temp = f_half[0].split(',')[0]
+        # Path -> (modification time, digest, styles or None if invalid)
+        self.files = {}
 
-                    # If initials and last name
-                    else:
-                        temp = f_half[0]
-                        for item in s_half:
-                            temp += item + '.'
-                    out += temp + ' '
+        self.data = {}
+        self.failed = False
 
+        self.styles = {}
+        self.validated = {}
+
+    def add_directory(self, path):
+        '''
+        Adds a folder of style files, each a JSON file in the format of
+        the main style file
+
+        @param path the folder
+        '''
+
+        self.style_dirs.append(path)
+        self.files = {}
+
+    def get_paths(self):
+        '''
+        Lists every style file, the main one first
+
+        @return a list of style file paths
+        '''
+
+        paths = [self.style_file]
+
+        for style_dir in self.style_dirs:
+            paths.extend(sorted(glob.glob(os.path.join(style_dir, '*.json'))))
+
+        return paths
+
+    def refresh(self):
+        '''
+        Reloads whichever style files have changed, forgetting the
+        compiled and validated styles if any did
+        '''
+
+        changed = False
+        files = {}
+
+        for path in self.get_paths():
+
+            mtime = os.stat(path).st_mtime
+            loaded = self.files.get(path)
+
+            if loaded is not None and loaded[0] == mtime:
+                files[path] = loaded
+                continue
+
+            with open(path, 'rb') as f:
+                content = f.read()
+
+            digest = hashlib.sha1(content).hexdigest()
+
+            if loaded is not None and loaded[1] == digest:
+                files[path] = (mtime, digest, loaded[2])
+                continue
+
+            try:
+                styles = json.loads(content.decode('utf-8'))
+            except ValueError:
+                styles = None
+
+            files[path] = (mtime, digest, styles)
+            changed = True
+
+        if changed or list(files) != list(self.files):
+
+            self.data = {}
+            self.failed = False
+
+            for path in files:
+                if files[path][2] is None:
+                    self.failed = True
                 else:
+                    self.data.update(files[path][2])
 
-                    # If no last name
-                    if not f_half:
-                        temp = name[0]
+            self.styles = {}
+            self.validated = {}
 
-                    # If no initials
-                    elif not s_half:
-                        temp = f_half[0].split(',')[0]
+        self.files = files
 
-                    # If initials and last name
-                    else:
-                        temp = f_half[0]
-                        for item in s_half:
-                            temp += item + '.'
-                    out += temp + ', '
+    def get_style_data(self, style_form, log):
+        '''
+        Extracts a specified style
 
-            return out
+        @param  style_form the style format to extract
+        @return            a dictionary containing style data
+        '''
 
-    elif isinstance(value, str):
-        return value + ', '
+        self.refresh()
 
-    else:
-        return str(value) + ', '
+        if self.failed:
+            log.log_data("\nError: Could not read style file.")
 
+        return self.data.get(style_form)
 
-def get_last(value):
-    '''
-    Extracts the last name of an author from Jinja2 contextual data
+    def get_style(self, style_form, log):
+        '''
+        Returns a specified style, compiling it once
 
-    @param  value   the data to filter
-    @return         the modified data
-    '''
+        @param  style_form the style format to extract
+        @return            the compiled Style
+        '''
 
-    result = ""
+        style_data = self.get_style_data(style_form, log)
 
-    if isinstance(value, list):
+        style = self.styles.get(style_form)
 
-        result = re.findall('^(.+?),', str(value[0]))
+        if style is None:
+            style = self.styles[style_form] = Style(style_data)
 
-        if result != []:
-            return result[0]
-        else:
-            return str(value[0])
+        return style
 
-    elif isinstance(value, str):
+    def get_valid_styles(self, log):
+        '''
+        Validates every style, logging the problems found; each style is
+        validated once and its problems logged again on later calls
 
-        result = re.findall('^(.+?),', value)
+        @return a list of valid styles
+        '''
 
-        if result != []:
-            return result[0]
+        self.refresh()
 
-        else:
-            return value
+        if self.failed:
+            log.log_data("\nError: Could not read style file.")
+            return ""
 
-    else:
-        return str(value)
+        valid_styles = []
 
+        for key in self.data:
 
-def construct_env():
-    '''
-    Constructs a Jinja2 environment with all filter functions added
+            if key not in self.validated:
+                style_log = logger.RecordingLogger()
+                valid = validate_style(self.data.get(key), style_log)
+                self.validated[key] = (valid, style_log.messages)
 
-    @return the Jinja2 custom environment
-    '''
+            valid, messages = self.validated[key]
 
-    environment = Environment(loader=BaseLoader)
-    environment.filters['wrap_html'] = wrap_html
-    environment.filters['add_chars'] = add_chars
-    environment.filters['wrap'] = wrap
-    environment.filters['font'] = font
-    environment.filters['add_to_front'] = add_to_front
-    environment.filters['authors_ccsc'] = authors_ccsc
-    environment.filters['authors_acm'] = authors_acm
-    environment.filters['authors_apa'] = authors_apa
-    environment.filters['get_last'] = get_last
+            for data_string in messages:
+                log.log_data(data_string)
 
-    return environment
+            # If key is valid, then append it to the list
+            if valid:
+                valid_styles.append(key)
+
+        return valid_styles
 
 ################################################
 # Function Definitions - Style File Interaction
 ################################################
 
 
-def get_valid_styles(log):
+def validate_style(style_data, log):
     '''
-    Validates the styles from the config folder and returns
-    a list of valid styles
+    Validates a single style, logging the first problem found
 
-    @return a list of valid styles
+    @param  style_data a dictionary containing style data
+    @return            whether the style is valid
     '''
 
-    style_file = "../config/styles.json"
-    valid_styles = []
+    # If style cannot be accessed log it
+    if style_data is None:
+        log.log_data('\nERROR - Could not retrieve style template')
+        return False
+
+    # Verify order field and its sub-fields exist
+    order = style_data.get('order')
+    if order is None:
+        log.log_data('\nERROR - Could not access "order" field in '
+                     'style template')
+        return False
+    else:
+        if 'method' not in order or (
+                'sortby' not in order and 'keys' not in order):
+            log.log_data('\nERROR - Missing "method" or "sortby" values '
+                         'in "order" field of style template.')
+            return False
+
+    # Verify in_text_style field and its sub-fields exist
+    in_text = style_data.get('in_text_style')
+    if in_text is None:
+        log.log_data('\nERROR - Could not access "in_text_style" field '
+                     'in style template')
+        return False
+    else:
+        if 'index' not in in_text or 'template' not in in_text:
+            log.log_data('\nERROR - Could not access "index" or '
+                         '"template" in "in_text_style" field of '
+                         'style template')
+            return False
+
+    # Verify title field exists
+    title = style_data.get('title')
+    if title is None:
+        log.log_data('\nERROR - Could not access "title" field in '
+                     'style template')
+        return False
+    else:
+        if 'key' not in title or 'template' not in title:
+            log.log_data('\nERROR - Missing "key" or "template" values '
+                         'in "title" field of style template.')
+            return False
 
-    # Open the pre-pathed style file
-    with open(style_file, 'r') as f:
-        try:
-            data = json.load(f)
-        except ValueError:
-            log.log_data("\nError: Could not read style file.")
-            return ""
+    # Verify default_style field exists
+    default = style_data.get('default_style')
+    if default is None:
+        log.log_data('\nERROR - Could not access "default_style" field '
+                     'in style template')
+        return False
 
-    # For each style in the style file
-    for key in data:
+    return True
 
-        style_data = data.get(key)
 
-        # If style cannot be accessed log it
-        if style_data is None:
-            log.log_data('\nERROR - Could not retrieve style template')
-            continue
+def get_registry():
+    '''
+    Returns the StyleRegistry shared by the process, constructing it once
 
-        else:
-            order = {}
-            in_text = {}
-            title = ""
-            default = ""
-
-            # Verify order field and its sub-fields exist
-            order = style_data.get('order')
-            if order is None:
-                log.log_data('\nERROR - Could not access "order" \
-                             field in style template')
-                continue
-            else:
-                if 'method' not in order or 'sortby' not in order:
-                    log.log_data('\nERROR - Missing "method" or "sortby" \
-                                 values in "order" field of style template.')
-                    continue
-
-            # Verify in_text_style field and its sub-fields exist
-            in_text = style_data.get('in_text_style')
-            if in_text is None:
-                log.log_data('\nERROR - Could not access "in_text_style"\
-                             field in style template')
-                continue
-            else:
-                if 'index' not in in_text or 'template' not in in_text:
-                    log.log_data('\nERROR - Could not access "index" or\
-                                 "template" in "in_text_style" field of\
-                                 style template')
-                    continue
-
-            # Verify title field exists
-            title = style_data.get('title')
-            if title is None:
-                log.log_data('\nERROR - Could not access "title" field \
-                             in style template')
-                continue
-            else:
-                if 'key' not in title or 'template' not in title:
-                    log.log_data('\nERROR - Missing "key" or "template"\
-                                 values in "title" field of style template.')
-                    continue
-
-            # Verify default_style field exists
-            default = style_data.get('default_style')
-            if default is None:
-                log.log_data('\nERROR - Could not access "default_style"\
-                             field in style template')
-                continue
+    @return the StyleRegistry of the style file in the config folder
+    '''
+
+    global REGISTRY
+
+    if REGISTRY is None:
+        REGISTRY = StyleRegistry()
+
+    return REGISTRY
+
+
+def get_valid_styles(log):
+    '''
+    Validates the styles from the config folder and returns
+    a list of valid styles
 
-        # If key is valid, then append it to the list
-        valid_styles.append(key)
+    @return a list of valid styles
+    '''
 
-    return valid_styles
+    return get_registry().get_valid_styles(log)
 
 
 def read_style_file(style_form, log):
@@ -703,16 +915,41 @@ def read_style_file(style_form, log):
     @return            a dictionary containing style data
     '''
 
-    style_file = "../config/styles.json"
+    return get_registry().get_style_data(style_form, log)
 
-    with open(style_file, 'r') as f:
-        try:
-            data = json.load(f)
-        except ValueError:
-            data = {}
-            log.log_data("\nError: Could not read style file.")
 
-    return data.get(style_form)
+def get_style_fields(style_data, environment=None):
+    '''
+    Finds the BibTeX fields a style can read from an entry: every
+    variable of its in-text and entry templates, the fields it sorts by,
+    and the type and key of the entry
+
+    @param  style_data  a dictionary containing style data
+    @param  environment the Jinja2 environment to parse templates with
+    @return             a set of field names
+    '''
+
+    if environment is None:
+        environment = construct_env()
+
+    templates = [
+        style_data.get('in_text_style', {}).get('template', ''),
+        style_data.get('default_style', '')]
+
+    for alt_style in style_data.get('extended_styles', {}).values():
+        templates.append(alt_style.get('template', ''))
+
+    fields = set(['ENTRYTYPE', 'ID'])
+
+    # The fields a style sorts by, including fallbacks
+    for sort_fields, descending in get_sort_keys(
+            style_data.get('order', {})) or []:
+        fields.update(sort_fields)
+
+    for template in templates:
+        fields |= meta.find_undeclared_variables(environment.parse(template))
+
+    return fields
 
 ################################################
 # Function Definitions - Style Data Formatting
@@ -758,291 +995,308 @@ def validate_citations(bib_tags, bib_data, log):
     return bib_tags
 
 
-def sort_alphabetical(bib_key, sort_list, ordered_cites):
+def get_collation_key(sort_value):
     '''
-    Sorts a set of citations alphabetically
+    Computes the collation key of a sort value: the first of a list of
+    values, such as authors, or a whole string, in the case-swapped
+    order references have always been sorted in
 
-    @param  bib_key         the associated reference section
-    @param  sort_list       the list of items to sort
-    @param  orderered_cites the dictionary containing sorted reference sections
-    @return                 ordered dictionary sections of the citations
+    @param  sort_value a list of sort values, or a single value
+    @return            the collation key
     '''
 
-    sorted_list = []
-    sorted_tags = []
-    to_sort = []
-    jinja_list = []
-    outer_list = []
-
-    temp_str = ""
+    if isinstance(sort_value, list):
 
-    # For each entry in bibliography
-    for item in sort_list:
+        if not sort_value:
+            return ''
 
-        # Sort a list of authors or titles for a BibTeX entry
-        item[2] = sorted(item[2], key=str.swapcase)
+        sort_value = min(sort_value, key=str.swapcase)
 
-        # Append the list of sorted authors/titles
-        to_sort.append(item[2][0])
+    return str(sort_value).swapcase()
 
-    # Sort the list of authors/titles/other from all acquired BibTeX entries
-    sorted_list = sorted(to_sort, key=str.swapcase)
 
-    # Create a list equal to the size of the sorted list
-    # TODO - Verify
-    for index in sorted_list:
-        sorted_tags.append(0)
+def get_sort_keys(order):
+    '''
+    Reads the sort keys of a style's order. An order either lists its
+    keys, each a field with optional fallback fields and a direction:
+
+        "order": {
+            "method": "alpha",
+            "keys": [
+                {"field": "author", "fallback": ["title"]},
+                {"field": "year", "direction": "descending"},
+                {"field": "title"}
+            ]
+        }
+
+    or names a single "sortby" field, author or title, each falling back
+    to the other. Any other "sortby" sorts by an entry's first field,
+    which is also where every key falls back to last.
+
+    @param  order the order of a style
+    @return       a list of (fields, descending) tuples, or None to keep
+                  citations in the order they are first cited
+    '''
 
-    # Create a list equal to the size of the sorted list
-    for index in sorted_list:
-        jinja_list.append(0)
+    if order.get('method') != 'alpha':
+        return None
 
-    # Extract the citation tags
-    for index in range(0, len(sorted_list)):
+    keys = order.get('keys')
 
-        for item in range(0, len(sorted_list)):
+    if keys is None:
+        if order.get('sortby') == 'author':
+            keys = [{'field': 'author', 'fallback': ['title']}]
+        elif order.get('sortby') == 'title':
+            keys = [{'field': 'title', 'fallback': ['author']}]
+        else:
+            keys = [{}]
 
-            # If item is in list to sort
-            if sorted_list[index] in sort_list[item][2]:
+    sort_keys = []
 
-                # Extract information and negate this item
-                # The same author may appear for many entries
-                # We choose the first available match and then nullify it
-                jinja_list[index] = sort_list[item][0]
-                sorted_tags[index] = sort_list[item][1]
-                sort_list[item][2] = ['#']
-                break
+    for key in keys:
 
-    # Add sorted items to the master list
-    outer_list.append(sorted_tags)
-    outer_list.append(jinja_list)
+        fields = list(key.get('fallback', []))
+        if 'field' in key:
+            fields.insert(0, key['field'])
 
-    # Associate the master list with a reference section
-    ordered_cites[bib_key] = outer_list
+        sort_keys.append(
+            (tuple(fields), key.get('direction') == 'descending'))
 
-    return ordered_cites
+    return sort_keys
 
 
-def organize_citations(bib_tags, bib_data, order):
+def compile_order(order):
     '''
-    Sorts a set of citations based on order chosen (alphabetic/numeric)
+    Compiles the order of a style into a function computing the sort key
+    of a BibTeX entry
 
-    @param  bib_tags BibTeX tags extracted from a document
-    @param  bib_data BibTeX database
-    @param  order    the order with which to arrange the tags
-    @return          ordered list of the citations extracted
+    @param  order the order of a style
+    @return       the key function, or None to keep citations in the
+                  order they are first cited
     '''
 
-    # Extract sorting method from style format
-    method = order.get('method')
-    sort_by = order.get('sortby')
-
-    jinja_var = ''
-    sort_item = ''
+    sort_keys = get_sort_keys(order)
 
-    tag_list = []
-    jinja_list = []
-    outer_list = []
-    triplet = []
-
-    # Dictionary that will contain sets of ordered citations
-    ordered_cites = {}
+    if sort_keys is None:
+        return None
 
-    # If we are to sort alphabetically
-    if method == 'alpha':
+    def get_key(entry):
 
-        # If we are to sort via authors
-        if sort_by == 'author':
+        key = []
 
-            # For each bibliography section
-            for bib in bib_tags:
+        for fields, descending in sort_keys:
 
-                # Grab the list of citations
-                citations = bib_tags.get(bib).get('citations')
+            # Use the first field present, else the entry's first value
+            for field in fields:
+                if field in entry:
+                    value = entry[field]
+                    break
+            else:
+                value = next(iter(entry.values()))
 
-                # Grab the entry key and sorting token
-                for entry_key in citations:
+            collation_key = get_collation_key(value)
 
-                    bib_key = citations.get(entry_key).get('bib_key')
-                    jinja_var = citations.get(entry_key).get('jinja_var')
+            # Negated code points, ended by a zero so that a longer
+            # string sorts before its own prefix, reverse the order
+            if descending:
+                collation_key = tuple(
+                    -ord(char) for char in collation_key) + (0,)
 
-                    if not bib_data.get(bib_key):
-                        continue
+            key.append(collation_key)
 
-                    # If author in BibTeX database
-                    if 'author' in bib_data.get(bib_key):
+        return tuple(key)
 
-                        sort_item = bib_data.get(bib_key).get('author')
+    return get_key
 
-                    # If title in BibTeX database and NOT author
-                    elif 'title' in bib_data.get(bib_key):
 
-                        sort_item = bib_data.get(bib_key).get('title')
+def sort_alphabetical(bib_key, sort_list, ordered_cites):
+    '''
+    Sorts a set of citations by their sort keys in a single stable sort,
+    so citations with equal keys keep the order they were cited in
 
-                    # No title and no author (unlikely), but grab next resource
-                    else:
-                        # Grab next available value
-                        sort_item = next(
-                            iter(
-                                bib_data.get(bib_key).values()
-                                )
-                            )
+    @param  bib_key         the associated reference section
+    @param  sort_list       a list of [jinja variable, BibTeX key,
+                            sort key] triplets
+    @param  orderered_cites the dictionary containing sorted reference sections
+    @return                 ordered dictionary sections of the citations
+    '''
 
-                    # Create a triplet of jinja variable, BibTeX key, and value
-                    triplet.append(jinja_var)
-                    triplet.append(bib_key)
-                    triplet.append(sort_item)
+    sort_list = sorted(sort_list, key=lambda item: item[2])
 
-                    # Append triplet to list to sort
-                    tag_list.append(triplet)
+    sorted_tags = [item[1] for item in sort_list]
+    jinja_list = [item[0] for item in sort_list]
 
-                    triplet = []
+    # Associate the master list with a reference section
+    ordered_cites[bib_key] = [sorted_tags, jinja_list]
 
-                # Sort this set of bibtex citations for this reference section
-                ordered_cites = sort_alphabetical(
-                    bib_tags.get(bib).get('jinja_var'),
-                    tag_list, ordered_cites)
-                tag_list = []
+    return ordered_cites
 
-        # If we are to sort via titles
-        elif sort_by == 'title':
 
-            # For each bibliography section
-            for bib in bib_tags:
+def organize_citations(bib_tags, bib_data, order):
+    '''
+    Sorts a set of citations based on order chosen (alphabetic/numeric).
+    Citations of keys missing from the BibTeX database are left out.
 
-                # Grab the list of citations
-                citations = bib_tags.get(bib).get('citations')
+    @param  bib_tags BibTeX tags extracted from a document
+    @param  bib_data BibTeX database
+    @param  order    the order with which to arrange the tags
+    @return          ordered list of the citations extracted
+    '''
 
-                # Grab the entry key and sorting token
-                for entry_key in citations:
+    # Compile the order once for every reference section
+    get_key = compile_order(order)
 
-                    bib_key = citations.get(entry_key).get('bib_key')
-                    jinja_var = citations.get(entry_key).get('jinja_var')
+    # Dictionary that will contain sets of ordered citations
+    ordered_cites = {}
 
-                    if not bib_data.get(bib_key):
-                        continue
+    # For each bibliography section
+    for bib in bib_tags:
 
-                    # If title in BibTeX database
-                    if 'title' in bib_data.get(bib_key):
+        tag_list = []
 
-                        sort_item = bib_data.get(bib_key).get('title')
+        # Grab the list of citations, in the order they are cited
+        citations = bib_tags.get(bib).get('citations')
 
-                    # If author in BibTeX database and NOT title
-                    elif 'author' in bib_data.get(bib_key):
+        for citation in citations.values():
 
-                        sort_item = bib_data.get(bib_key).get('author')
+            bib_key = citation.get('bib_key')
 
-                    # If author and title NOT in BibTeX database
-                    else:
-                        # Grab next available value
-                        sort_item = next(
-                            iter(
-                                bib_data.get(bib_key).values()
-                                )
-                            )
+            if not bib_data.get(bib_key):
+                continue
 
-                    # Create a triplet of jinja variable, BibTeX key
-                    triplet.append(jinja_var)
-                    triplet.append(bib_key)
-                    triplet.append(sort_item)
+            # Sort keys are computed once per citation
+            if get_key is None:
+                sort_key = ()
+            else:
+                sort_key = get_key(bib_data.get(bib_key))
 
-                    # Append triplet to list to sort
-                    tag_list.append(triplet)
+            tag_list.append([citation.get('jinja_var'), bib_key, sort_key])
 
-                    triplet = []
+        ordered_cites = sort_alphabetical(
+            bib_tags.get(bib).get('jinja_var'), tag_list, ordered_cites)
 
-                # Sort this set of bibtex citations for this reference section
-                ordered_cites = sort_alphabetical(
-                    bib_tags.get(bib).get('jinja_var'),
-                    tag_list, ordered_cites)
-                tag_list = []
+    return ordered_cites
 
-        # Default to first-available field
-        else:
-            # For each bibliography section
-            for bib in bib_tags:
 
-                # Grab the list of citations
-                citations = bib_tags.get(bib).get('citations')
+def get_render_context(entry, token, index, context=None):
+    '''
+    Overlays the citation number and any other per-document values on a
+    database entry without modifying it, so one parsed database can be
+    rendered by any number of documents at once
+
+    @param  entry   a BibTeX database entry
+    @param  token   the variable holding the citation number
+    @param  index   the citation number
+    @param  context a dictionary of per-document values, or None
+    @return         the RenderContext to render the entry with
+    '''
 
-                # Grab the entry key and sorting token
-                for entry_key in citations:
+    if context:
+        values = dict(context)
+        values[token] = index
+    else:
+        values = {token: index}
 
-                    bib_key = citations.get(entry_key).get('bib_key')
-                    jinja_var = citations.get(entry_key).get('jinja_var')
+    return RenderContext(values, entry)
 
-                    sort_item = next(
-                        iter(
-                            bib_data.get(bib_key).values()
-                            )
-                        )
 
-                    # Create a triplet of jinja variable, BibTeX key
-                    triplet.append(jinja_var)
-                    triplet.append(bib_key)
-                    triplet.append(sort_item)
+def render_template(template, context):
+    '''
+    Renders a template with a RenderContext read in place. Jinja2's
+    Template.render copies its variables into a dictionary, reading and
+    so normalizing every field of a lazy entry; the context is instead
+    given to Jinja2 as the shared parent of the template's variables,
+    ahead of the environment globals, so only the fields the template
+    uses are read.
+
+    @param  template a compiled template
+    @param  context  the RenderContext to render
+    @return          the rendered string
+    '''
 
-                    tag_list.append(triplet)
+    if isinstance(template, native.NativeTemplate):
+        return template.render(context)
 
-                    triplet = []
+    variables = template.new_context(
+        collections.ChainMap(context, template.globals), shared=True)
 
-                # Sort this set of bibtex citations for this reference section
-                ordered_cites = sort_alphabetical(
-                    bib_tags.get(bib).get('jinja_var'),
-                    tag_list, ordered_cites)
-                tag_list = []
+    try:
+        return template.environment.concat(
+            template.root_render_func(variables))
+    except Exception:
+        return template.environment.handle_exception()
 
-    # Default to first-written-first-cited
-    else:
 
-        # This is the count of citations used to interface with the Jinja
-        c_count = 0
+def get_render_prefix(cache, style, database, context=None):
+    '''
+    Builds the part of the cache key shared by every reference rendered
+    from one database version with the same per-document values
+
+    @param  cache    the DiskCache of rendered references
+    @param  style    the compiled Style
+    @param  database the version of the BibTeX database, as returned by
+                     wibtex_parser.get_database_version
+    @param  context  a dictionary of per-document values, or None
+    @return          the key prefix
+    '''
 
-        # Access string used to retrieve document keys extracted
-        access_str = ""
+    return cache.make_key(
+        RENDER_VERSION, database, style.token,
+        sorted(context.items()) if context else None)
 
-        # For each reference section
-        for key in bib_tags:
 
-            citations = bib_tags.get(key).get('citations')
+def render_reference(style, entry, index, context=None, cache=None,
+                     prefix=None):
+    '''
+    Renders the reference of an entry, reusing the rendering stored by
+    an earlier run when a cache is given. A rendering is keyed by the
+    prefix of its database version and per-document values, the version
+    of its template, its citation key and its citation number, so no
+    entry is hashed field by field.
+
+    @param  style   the compiled Style
+    @param  entry   a BibTeX database entry
+    @param  index   the citation number
+    @param  context a dictionary of per-document values, or None
+    @param  cache   a DiskCache of rendered references, or None
+    @param  prefix  the key prefix from get_render_prefix, required
+                    along with the cache
+    @return         the rendered reference
+    '''
 
-            # For each tag in the reference section
-            for tag in range(0, len(citations.keys())):
+    entrytype = entry['ENTRYTYPE']
 
-                # Generate the access key (i.e. 'cite + X')
-                access_str = "cite" + str(c_count)
+    # Look up the preferred or supported style, else the default
+    templator = style.get_template(entrytype)
 
-                # Append bib key and corresponding jinja var to lists
-                tag_list.append(citations[access_str]['bib_key'])
-                jinja_list.append(citations[access_str]['jinja_var'])
+    if cache is None or prefix is None:
+        return render_template(
+            templator, get_render_context(entry, style.token, index, context))
 
-                c_count += 1
+    key = cache.make_key(
+        prefix, style.get_version(entrytype), entry['ID'], index)
 
-            # Reset count for next access section
-            c_count = 0
+    reference = cache.get(key)
 
-            # Append list of jinja vars and bib keys to master list
-            outer_list.append(tag_list)
-            outer_list.append(jinja_list)
+    if reference is None:
+        reference = render_template(
+            templator, get_render_context(entry, style.token, index, context))
 
-            # Associate a reference section with the master list and reset
-            ordered_cites[key] = outer_list
-            tag_list = []
-            jinja_list = []
-            outer_list = []
+        # Old renderings are evicted once every section is rendered
+        cache.put(key, reference, evict=False)
 
-    return ordered_cites
+    return reference
 
 
-def generate_citations(bib_data, ordered_cites, style_data, environment):
+def generate_citations(bib_data, ordered_cites, style, context=None):
     '''
     Generates in-text citations for the document from a pre-ordained
     style
 
     @param bib_data      a dictionary containing BibTeX database entries
     @param ordered_cites a dictionary containing citation keys/jinja variables
-    @param style_data    a dicitonary containing style template data
-    @param environment   a Jinja2 environment with custom filters
+    @param style         the compiled Style
+    @param context       a dictionary of per-document values, or None
 
     @return              a dictionary containing formatted reference data
     '''
@@ -1052,10 +1306,10 @@ def generate_citations(bib_data, ordered_cites, style_data, environment):
 
     index = 1
 
-    token = style_data.get('index')
-    template = style_data.get('template')
-
-    templator = environment.from_string(template)
+    # (key, number) -> rendered citation; the style and per-document
+    # values are the same for every citation of one document, so a key
+    # cited many times is rendered once
+    rendered = {}
 
     # For each reference section
     for bib in ordered_cites:
@@ -1063,12 +1317,15 @@ def generate_citations(bib_data, ordered_cites, style_data, environment):
         # Extract the current reference section
         cur_bib = ordered_cites.get(bib)
 
+        # A key cited more than once takes the number of its last citation
+        numbers = {}
+
         # For each citation tag
         for item in cur_bib[0]:
 
             # Set the numerical index of that citation
             if item:
-                bib_data[item][token] = index
+                numbers[item] = index
 
             # Increment the index
             index += 1
@@ -1076,9 +1333,16 @@ def generate_citations(bib_data, ordered_cites, style_data, environment):
         # For each item in the current reference section
         for item in range(0, len(cur_bib[1])):
 
+            key = cur_bib[0][item]
+            number = numbers.get(key)
+
             # Render the template string and assign the key as its jinja
-            output[cur_bib[1][item]] = templator.render(
-                bib_data[cur_bib[0][item]])
+            if (key, number) not in rendered:
+                rendered[(key, number)] = render_template(
+                    style.in_text, get_render_context(
+                        bib_data[key], style.token, number, context))
+
+            output[cur_bib[1][item]] = rendered[(key, number)]
 
         # Reset the index
         index = 1
@@ -1086,140 +1350,102 @@ def generate_citations(bib_data, ordered_cites, style_data, environment):
     return output
 
 
-def generate_works_cited(
-        bib_data, ordered_cites,
-        style_data, environment, output):
+def render_section(style, entries, context=None, cache=None, prefix=None):
+    '''
+    Renders the references of a section, numbered from one, joining
+    them once rather than growing a string reference by reference
+
+    @param  style   the compiled Style
+    @param  entries the BibTeX database entries of the section, in order
+    @param  context a dictionary of per-document values, or None
+    @param  cache   a DiskCache of rendered references, or None
+    @param  prefix  the key prefix from get_render_prefix, or None
+    @return         the rendered references
+    '''
+
+    return ''.join([
+        render_reference(style, entries[position], position + 1,
+                         context, cache, prefix)
+        for position in range(0, len(entries))])
+
+
+def generate_works_cited(bib_data, ordered_cites, style, output,
+                         context=None, cache=None, database=None):
     '''
     Generates reference sections based upon a preordained style
 
     @param bib_data      a dictionary containing BibTeX database entries
     @param ordered_cites a dictionary containing citation keys/jinja variables
-    @param style_data    a dicitonary containing style template data
-    @param environment   a Jinja2 environment with custom filters
+    @param style         the compiled Style
     @param output        a dictionary containing formatted reference data
+    @param context       a dictionary of per-document values, or None
+    @param cache         a DiskCache of references rendered by earlier
+                         runs, or None
+    @param database      the version of the BibTeX database the entries
+                         were parsed from; the cache is only used with it
 
     @return              a dictionary containing formatted reference data
     '''
 
-    # Index for numbering citations
-    index = 1
-
-    # Extract the in-text citation token as it may be used
-    token = style_data.get('in_text_style').get('index')
-
     bib_list = []
 
-    bib_string = ""
+    prefix = None
+    if cache is not None and database is not None:
+        prefix = get_render_prefix(cache, style, database, context)
 
     header = {}
 
-    extended_styles = {}
-    alt_style = {}
-
-    found = False
-
-    default = style_data.get('default_style')
-    template = ""
-    entrytype = ""
+    # The reference title is the same for every bibliography
+    header[style.title_key] = style.title_key
+    title = style.title.render(header)
 
     # For each bibliography
     for bib in ordered_cites:
 
-        # Constrtuct the reference title
-        header[style_data.get('title').get('key')] = (
-            style_data.get('title').get('key')
-        )
-        templator = environment.from_string(
-            style_data.get('title').get('template'))
-        bib_string += templator.render(header)
-
         # Extract the reference section
         bib_list = ordered_cites.get(bib)
 
-        # For each citation key
-        for key in bib_list[0]:
-
-            # Add the numerical token to the
-            bib_data[key][token] = index
-
-            # Extract the entry type
-            entrytype = bib_data[key]['ENTRYTYPE']
-
-            # Construct the template from the BibTeX entry key
-            extended_styles = style_data.get('extended_styles')
-
-            # Set template to the default incase we can't find a valid
-            template = default
-
-            # Grab the preferred or supported style, else default to default
-            if extended_styles:
-
-                # For each alternate style
-                for type in extended_styles:
-
-                    # Grab the alternate style
-                    alt_style = extended_styles.get(type)
-
-                    # If BibTeX entry part of preferred
-                    if entrytype in alt_style.get('preferred'):
-                        template = alt_style.get('template')
-                        found = True
-
-                    # If BibTeX entry part of supported and not preferred
-                    if (
-                        found is False and
-                            entrytype in alt_style.get('supported')):
-                            template = alt_style.get('template')
-
-            # Render the chosen template
-            templator = environment.from_string(template)
-
-            # Add reference string to master reference
-            bib_string += templator.render(bib_data[key])
+        # Add the titled reference section to the master dictionary
+        output[bib] = title + render_section(
+            style, [bib_data[key] for key in bib_list[0]], context,
+            cache, prefix)
 
-            # Reset the filtering tokens
-            found = False
-
-            # Increment the index counter
-            index += 1
-
-        # Add the formatted reference string to the master dictionary
-        output[bib] = bib_string
-
-        # Reset the index and the reference string
-        bib_string = ""
-        index = 1
+    if prefix is not None:
+        cache.evict()
 
     return output
 
 
-def get_reference_data(style_form, bib_tags, bib_data, log):
+def get_reference_data(style_form, bib_tags, bib_data, log, context=None,
+                       cache=None, database=None):
 
-    style_data = {}
     ordered_cites = {}
     output = {}
 
-    # Read style file and extract style choice
-    style_data = read_style_file(style_form, log)
+    # Read style file and extract the compiled style choice
+    style = get_registry().get_style(style_form, log)
 
     # Validate that citations are in BibTeX database
     bib_tags = validate_citations(bib_tags, bib_data, log)
 
     # Organize citations according to style
-    ordered_cites = organize_citations(
-        bib_tags, bib_data,
-        style_data.get('order'))
-
-    # Construct the Jinja2 environment
-    environment = construct_env()
+    ordered_cites = organize_citations(bib_tags, bib_data, style.order)
 
     # Generate in-text citations
-    output = generate_citations(
-        bib_data, ordered_cites,
-        style_data.get('in_text_style'), environment)
+    output = generate_citations(bib_data, ordered_cites, style, context)
 
     # Generate reference page
     output = generate_works_cited(
-        bib_data, ordered_cites, style_data, environment, output)
+        bib_data, ordered_cites, style, output, context, cache, database)
 
     return output
+
+################################################
+# Compile the Style Bundle
+################################################
+
+if __name__ == '__main__':
+
+    # Input is of the form: style.py [style files]
+    count = compile_bundle(sys.argv[1:] or (STYLE_FILE,))
+    print("Compiled %d templates into %s" % (count, get_bundle_path()))
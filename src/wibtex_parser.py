@@ -10,14 +10,235 @@
 # Import Python Modules
 ################################################
 
-import re
+import os
+import sys
+import json
+import hashlib
+import collections
+import collections.abc
+import concurrent.futures
 import logger
 import bibtexparser
+import bib_index
+import names
 import map
 from bibtexparser.bparser import BibTexParser
 from bibtexparser.customization import *
 from bibtexparser.latexenc import *
 
+################################################
+# Constants
+################################################
+
+# Translation table removing preservation braces and backslashes
+STRIP_TABLE = {ord('{'): None, ord('}'): None, ord('\\'): None}
+
+# Version of the parsed output, increment whenever it changes
+PARSER_VERSION = 3
+
+# Number of chunks handed to each worker of a parallel parse
+CHUNKS_PER_WORKER = 4
+
+# Fields required by each type of BibTeX entry
+SCHEMA_FILE = '../config/required_fields.json'
+
+# The compiled required-fields schema, read on first use
+SCHEMA = None
+
+# Longest field value interned by lazy entries; longer values seldom repeat
+INTERN_LIMIT = 128
+
+################################################
+# Class Definitions
+################################################
+
+
+# A problem found with a BibTeX entry: the entry has no 'id', no entry
+# 'type', or is missing the required 'fields' listed
+ValidationResult = collections.namedtuple(
+    'ValidationResult', ['index', 'key', 'problem', 'missing'])
+
+
+class LazyEntry(collections.abc.MutableMapping):
+
+    # Entries with the same fields, in the same order, share one shape
+    shapes = {}
+
+    # Marks a field which has not been normalized yet
+    UNDECODED = object()
+
+    __slots__ = ('shape', 'values', 'decoded')
+
+    def __init__(self, fields):
+        '''
+        Wraps the raw fields of a parsed BibTeX entry so that each field
+        is normalized the first time it is read, then memoized. Fields
+        which are never read, such as long abstracts, are never decoded.
+
+        The entry is stored compactly: field names live in a shape
+        shared by every entry with the same fields, values in a tuple,
+        and short values such as journal and publisher names are
+        interned so repeated ones are stored once.
+
+        @param fields the raw fields of the entry
+        '''
+
+        self.shape = LazyEntry.get_shape(tuple(fields))
+        self.values = tuple(intern_value(value) for value in fields.values())
+        self.decoded = None
+
+    @staticmethod
+    def get_shape(keys):
+        '''
+        Returns the shared shape of entries with the given fields
+
+        @param  keys a tuple of field names
+        @return      a dictionary mapping each field to its position
+        '''
+
+        shape = LazyEntry.shapes.get(keys)
+
+        if shape is None:
+            shape = dict(
+                (sys.intern(keys[position]), position)
+                for position in range(0, len(keys)))
+            LazyEntry.shapes[keys] = shape
+
+        return shape
+
+    def get_raw(self, key, default=None):
+        '''
+        Reads the raw value of a field without normalizing it
+
+        @param  key     the field name
+        @param  default the value to return when the field is missing
+        @return         the raw value
+        '''
+
+        position = self.shape.get(key)
+
+        if position is None:
+            return default
+
+        return self.values[position]
+
+    def select(self, keys):
+        '''
+        Copies the entry with only some of its fields, keeping those
+        already normalized
+
+        @param  keys the set of field names to keep
+        @return      a new LazyEntry
+        '''
+
+        kept = [
+            (key, position) for key, position in self.shape.items()
+            if key in keys]
+
+        entry = LazyEntry.__new__(LazyEntry)
+        entry.shape = LazyEntry.get_shape(tuple(key for key, position in kept))
+        entry.values = tuple(self.values[position] for key, position in kept)
+
+        if self.decoded is None:
+            entry.decoded = None
+        else:
+            entry.decoded = [
+                self.decoded[position] for key, position in kept]
+
+        return entry
+
+    def __getstate__(self):
+
+        # Keep the normalized values only; the marker does not pickle
+        decoded = {}
+        if self.decoded is not None:
+            for position in range(0, len(self.decoded)):
+                if self.decoded[position] is not LazyEntry.UNDECODED:
+                    decoded[position] = self.decoded[position]
+
+        return (tuple(self.shape), self.values, decoded)
+
+    def __setstate__(self, state):
+
+        keys, self.values, decoded = state
+
+        self.shape = LazyEntry.get_shape(keys)
+        self.decoded = None
+
+        if decoded:
+            self.decoded = [LazyEntry.UNDECODED] * len(self.values)
+            for position in decoded:
+                self.decoded[position] = decoded[position]
+
+    def __getitem__(self, key):
+
+        position = self.shape[key]
+
+        if self.decoded is None:
+            self.decoded = [LazyEntry.UNDECODED] * len(self.values)
+
+        value = self.decoded[position]
+
+        if value is LazyEntry.UNDECODED:
+
+            value = normalize_field(self.values[position], map.get_rosetta())
+
+            # Authors are sorted and split once normalized, as
+            # convert_to_dictionary does for eagerly normalized entries
+            if key == 'author' and value:
+                value = names.get_names(sorted(value, key=str.swapcase))
+
+            self.decoded[position] = value
+
+        return value
+
+    def __setitem__(self, key, value):
+
+        if self.decoded is None:
+            self.decoded = [LazyEntry.UNDECODED] * len(self.values)
+
+        position = self.shape.get(key)
+
+        # Values set after parsing are stored as they are
+        if position is None:
+            self.shape = LazyEntry.get_shape(tuple(self.shape) + (key,))
+            self.values = self.values + (value,)
+            self.decoded.append(value)
+
+        else:
+            self.values = (
+                self.values[:position] + (value,) +
+                self.values[position + 1:])
+            self.decoded[position] = value
+
+    def __delitem__(self, key):
+
+        position = self.shape[key]
+
+        keys = list(self.shape)
+        del keys[position]
+
+        self.shape = LazyEntry.get_shape(tuple(keys))
+        self.values = self.values[:position] + self.values[position + 1:]
+
+        if self.decoded is not None:
+            del self.decoded[position]
+
+    def __contains__(self, key):
+        return key in self.shape
+
+    def keys(self):
+        return self.shape.keys()
+
+    def __iter__(self):
+        return iter(self.shape)
+
+    def __len__(self):
+        return len(self.shape)
+
+    def __repr__(self):
+        return 'LazyEntry(%r)' % dict(self)
+
 ################################################
 # Function Definitions
 ################################################
@@ -36,515 +257,285 @@ def customizations(record):
     return record
 
 
-def validate_entries(database, log, flag=True):
+def load_schema(path=SCHEMA_FILE):
     '''
-    Validates a BibTeX database for proper entry inputs
+    Reads the fields each type of BibTeX entry requires and compiles
+    them for validation
 
-    @param  database a BibTeX database in the form of a dictionary
+    @param  path the JSON file mapping entry types to lists of fields
+    @return      a dictionary mapping each entry type to a tuple of its
+                 required fields, in order, and a frozenset of them
     '''
 
-    if flag:
-        # For each entry in the database
-        for index in range(0, len(database)):
+    with open(path, 'r') as f:
+        data = json.load(f)
 
-            current_entry = database[index]
+    return dict(
+        (entry_type, (tuple(fields), frozenset(fields)))
+        for entry_type, fields in data.items())
 
-            try:
 
-                entry_id = (current_entry)['ID']
+def get_schema(log):
+    '''
+    Returns the compiled required-fields schema, reading it once
 
-            except KeyError:
+    @return the compiled schema, or an empty one if it cannot be read
+    '''
 
-                log.log_data("\nError: BibTeX entry #%d \
-                             does not have an ID" % index)
+    global SCHEMA
 
-            # Verify entries have their respective, required fields
-            try:
+    if SCHEMA is None:
+        try:
+            SCHEMA = load_schema()
+        except (IOError, ValueError):
+            log.log_data("\nError: Could not read required fields file.")
+            return {}
 
-                error_string = ""
+    return SCHEMA
 
-                if current_entry['ENTRYTYPE'] == "article":
 
-                    if "author" not in current_entry:
-                        error_string += "author"
+def check_entries(database, schema, start=0):
+    '''
+    Checks a list of BibTeX entries for an ID, an entry type and the
+    fields their type requires. Entry types missing from the schema
+    require no fields.
+
+    @param  database a list of BibTeX entries
+    @param  schema   the compiled required-fields schema
+    @param  start    the index of the first entry in the whole database
+    @return          a list of ValidationResult tuples in entry order
+    '''
 
-                    if "title" not in current_entry:
-                        if error_string != "":
-                            error_string += ", title"
-                        else:
-                            error_string += "title"
+    results = []
 
-                    if "journal" not in current_entry:
-                        if error_string != "":
-                            error_string += ", journal"
-                        else:
-                            error_string += "journal"
+    for index, entry in enumerate(database, start):
 
-                    if "year" not in current_entry:
-                        if error_string != "":
-                            error_string += ", year"
-                        else:
-                            error_string += "year"
-
-                    if error_string != "":
-                        log.log_data("\nError: Entry {:20s} missing: {:20s}"
-                                     .format(entry_id, error_string))
-                elif current_entry['ENTRYTYPE'] == "book":
-                    if "author" not in current_entry:
-                        error_string += "author"
-
-                    if "title" not in current_entry:
-                        if error_string != "":
-                            error_string += ", title"
-                        else:
-                            error_string += "title"
-
-                    if "publisher" not in current_entry:
-                        if error_string != "":
-                            error_string += ", publisher"
-                        else:
-                            error_string += "publisher"
-
-                    if "year" not in current_entry:
-                        if error_string != "":
-                            error_string += ", year"
-                        else:
-                            error_string += "year"
-
-                    if error_string != "":
-                        log.log_data("\nError: Entry {:20s} missing: {:20s}"
-                                     .format(entry_id, error_string))
-
-                elif current_entry['ENTRYTYPE'] == "booklet":
-
-                    if "title" not in current_entry:
-                            error_string += "title"
-
-                    if error_string != "":
-                        log.log_data("\nError: Entry {:20s} missing: {:20s}"
-                                     .format(entry_id, error_string))
-
-                elif current_entry['ENTRYTYPE'] == "conference":
-
-                    if "author" not in current_entry:
-                        error_string += "author"
-
-                    if "title" not in current_entry:
-                        if error_string != "":
-                            error_string += ", title"
-                        else:
-                            error_string += "title"
-
-                    if "booktitle" not in current_entry:
-                        if error_string != "":
-                            error_string += ", booktitle"
-                        else:
-                            error_string += "booktitle"
-
-                    if "year" not in current_entry:
-                        if error_string != "":
-                            error_string += ", year"
-                        else:
-                            error_string += "year"
-
-                    if error_string != "":
-                        log.log_data("\nError: Entry {:20s} missing: {:20s}"
-                                     .format(entry_id, error_string))
-
-                elif current_entry['ENTRYTYPE'] == "inbook":
-
-                    if "author" not in current_entry:
-                        error_string += "author"
-
-                    if "editor" not in current_entry:
-                        if error_string != "":
-                            error_string += ", editor"
-                        else:
-                            error_string += "editor"
-
-                    if "title" not in current_entry:
-                        if error_string != "":
-                            error_string += ", title"
-                        else:
-                            error_string += "title"
-
-                    if "chapter" not in current_entry:
-                        if error_string != "":
-                            error_string += ", chapter"
-                        else:
-                            error_string += "chapter"
-
-                    if "pages" not in current_entry:
-                        if error_string != "":
-                            error_string += ", pages"
-                        else:
-                            error_string += "pages"
-                    if "publisher" not in current_entry:
-                        if error_string != "":
-                            error_string += ", publisher"
-                        else:
-                            error_string += "publisher"
-
-                    if "year" not in current_entry:
-                        if error_string != "":
-                            error_string += ", year"
-                        else:
-                            error_string += "year"
-
-                    if error_string != "":
-                        log.log_data("\nError: Entry {:20s} missing: {:20s}"
-                                     .format(entry_id, error_string))
-
-                elif current_entry['ENTRYTYPE'] == "incollection":
-                    if "author" not in current_entry:
-                        error_string += "author"
-
-                    if "title" not in current_entry:
-                        if error_string != "":
-                            error_string += ", title"
-                        else:
-                            error_string += "title"
-
-                    if "booktitle" not in current_entry:
-                        if error_string != "":
-                            error_string += ", booktitle"
-                        else:
-                            error_string += "booktitle"
-                    if "publisher" not in current_entry:
-                        if error_string != "":
-                            error_string += ", publisher"
-                        else:
-                            error_string += "publisher"
-
-                    if "year" not in current_entry:
-                        if error_string != "":
-                            error_string += ", year"
-                        else:
-                            error_string += "year"
-
-                    if error_string != "":
-                        log.log_data("\nError: Entry {:20s} missing: {:20s}"
-                                     .format(entry_id, error_string))
-
-                elif current_entry['ENTRYTYPE'] == "inproceedings":
-                    if "author" not in current_entry:
-                        error_string += "author"
-
-                    if "title" not in current_entry:
-                        if error_string != "":
-                            error_string += ", title"
-                        else:
-                            error_string += "title"
-
-                    if "booktitle" not in current_entry:
-                        if error_string != "":
-                            error_string += ", booktitle"
-                        else:
-                            error_string += "booktitle"
-
-                    if "year" not in current_entry:
-                        if error_string != "":
-                            error_string += ", year"
-                        else:
-                            error_string += "year"
-
-                    if error_string != "":
-                        log.log_data("\nError: Entry {:20s} missing: {:20s}"
-                                     .format(entry_id, error_string))
-
-                elif current_entry['ENTRYTYPE'] == "manual":
-                    if "title" not in current_entry:
-                        if error_string != "":
-                            error_string += ", title"
-                        else:
-                            error_string += "title"
-
-                    if error_string != "":
-                        log.log_data("\nError: Entry {:20s} missing: {:20s}"
-                                     .format(entry_id, error_string))
-
-                elif current_entry['ENTRYTYPE'] == "mastersthesis":
-                    if "author" not in current_entry:
-                        error_string += "author"
-
-                    if "title" not in current_entry:
-                        if error_string != "":
-                            error_string += ", title"
-                        else:
-                            error_string += "title"
-
-                    if "school" not in current_entry:
-                        if error_string != "":
-                            error_string += ", school"
-                        else:
-                            error_string += "school"
-
-                    if "year" not in current_entry:
-                        if error_string != "":
-                            error_string += ", year"
-                        else:
-                            error_string += "year"
-
-                    if error_string != "":
-                        log.log_data("\nError: Entry {:20s} missing: {:20s}"
-                                     .format(entry_id, error_string))
-
-                elif current_entry['ENTRYTYPE'] == "misc":
-                    continue
-
-                elif current_entry['ENTRYTYPE'] == "phdthesis":
-                    if "author" not in current_entry:
-                        error_string += "author"
-
-                    if "title" not in current_entry:
-                        if error_string != "":
-                            error_string += ", title"
-                        else:
-                            error_string += "title"
-
-                    if "school" not in current_entry:
-                        if error_string != "":
-                            error_string += ", school"
-                        else:
-                            error_string += "school"
-
-                    if "year" not in current_entry:
-                        if error_string != "":
-                            error_string += ", year"
-                        else:
-                            error_string += "year"
-
-                    if error_string != "":
-                        log.log_data("\nError: Entry {:20s} missing: {:20s}"
-                                     .format(entry_id, error_string))
-
-                elif current_entry['ENTRYTYPE'] == "proceedings":
-                    if "title" not in current_entry:
-                        if error_string != "":
-                            error_string += ", title"
-                        else:
-                            error_string += "title"
-
-                    if "year" not in current_entry:
-                        if error_string != "":
-                            error_string += ", year"
-                        else:
-                            error_string += "year"
-
-                    if error_string != "":
-                        log.log_data("\nError: Entry {:20s} missing: {:20s}"
-                                     .format(entry_id, error_string))
-
-                elif current_entry['ENTRYTYPE'] == "techreport":
-                    if "author" not in current_entry:
-                        error_string += "author"
-
-                    if "title" not in current_entry:
-                        if error_string != "":
-                            error_string += ", title"
-                        else:
-                            error_string += "title"
-
-                    if "institution" not in current_entry:
-                        if error_string != "":
-                            error_string += ", institution"
-                        else:
-                            error_string += "institution"
-
-                    if "year" not in current_entry:
-                        if error_string != "":
-                            error_string += ", year"
-                        else:
-                            error_string += "year"
-
-                    if error_string != "":
-                        log.log_data("\nError: Entry {:20s} missing: {:20s}"
-                                     .format(entry_id, error_string))
-
-                elif current_entry['ENTRYTYPE'] == "unpublished":
-                    if "author" not in current_entry:
-                        error_string += "author"
-
-                    if "title" not in current_entry:
-                        if error_string != "":
-                            error_string += ", title"
-                        else:
-                            error_string += "title"
-
-                    if "note" not in current_entry:
-                        if error_string != "":
-                            error_string += ", note"
-                        else:
-                            error_string += "note"
-
-                    if error_string != "":
-                        log.log_data("\nError: Entry {:20s} missing: {:20s}"
-                                     .format(entry_id, error_string))
-
-                else:
-                    return
-
-            except KeyError:
-                log.log_data("\nError: Entry type not listed in \
-                             BibTeX entry #%d" % index)
-
-    return
-
-
-def fix_escape_chars(database):
-    '''
-    Strips backslashes from a BibTeX database
+        # Lazy entries are checked by their raw fields, decoding none
+        if isinstance(entry, LazyEntry):
+            get = entry.get_raw
+        else:
+            get = entry.get
 
-    @param  database a BibTeX database in the form of a dictionary
-    '''
+        entry_id = get('ID')
+        if entry_id is None:
+            results.append(ValidationResult(index, '', 'id', ()))
+            entry_id = ''
 
-    temp_dict = {}
-    temp_list = []
+        entry_type = get('ENTRYTYPE')
+        if entry_type is None:
+            results.append(ValidationResult(index, entry_id, 'type', ()))
+            continue
 
-    # For each dictionary
-    for index in range(0, len(database)):
+        required = schema.get(entry_type)
 
-        temp_dict = database[index]
+        # Most entries hold every required field
+        if required is None or entry.keys() >= required[1]:
+            continue
 
-        # For each key
-        for key in temp_dict:
+        missing = required[1] - entry.keys()
+        results.append(ValidationResult(
+            index, entry_id, 'fields',
+            tuple(field for field in required[0] if field in missing)))
 
-            # If entry is a list
-            if isinstance(temp_dict[key], list):
+    return results
 
-                for item in temp_dict[key]:
 
-                    temp_list.append(item.replace("\\", ""))
+def format_result(result):
+    '''
+    Describes a validation result as a log message
 
-                temp_dict[key] = temp_list
-                temp_list = []
+    @param  result a ValidationResult
+    @return        the message
+    '''
 
-            else:
-                temp_dict[key] = temp_dict[key].replace("\\", "")
+    if result.problem == 'id':
+        return "\nError: BibTeX entry #%d does not have an ID" % result.index
 
-        database[index] = temp_dict
+    if result.problem == 'type':
+        return ("\nError: Entry type not listed in BibTeX entry #%d"
+                % result.index)
 
-    return database
+    return "\nError: Entry {:20s} missing: {:20s}".format(
+        result.key, ', '.join(result.missing))
 
 
-def latex_to_unicode(database):
+def validate_entries(database, log, flag=True, workers=1):
     '''
-    Converts a TeX character codes to Unicode
+    Validates a BibTeX database for proper entry inputs, logging every
+    problem found
 
-    @param  database a BibTeX database in the form of a dictionary
+    @param  database a list of BibTeX entries
+    @param  workers  the number of processes to check entries with
+    @return          a list of ValidationResult tuples in entry order
     '''
 
-    key_item_list = []
-    matches = []
-    converted_matches = []
-    item_string = ""
+    if not flag:
+        return []
 
-    convert = map.RosettaStone()
+    schema = get_schema(log)
 
-    regex = r'\\.[^\s\r\n]*\{.[^\s\r\n]*\}|\\\w+[^\s]'
+    if workers > 1 and len(database) > workers:
 
-    # For each entry
-    for index in range(0, len(database)):
+        # Check contiguous chunks so that results stay in entry order
+        size = len(database) // workers + 1
+        starts = range(0, len(database), size)
 
-        sub_dict = database[index]
+        results = []
+        with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+            for chunk_results in executor.map(
+                    check_entries,
+                    [database[start:start + size] for start in starts],
+                    [schema] * len(starts), starts):
+                results.extend(chunk_results)
 
-        # For each key
-        for key in sub_dict:
+    else:
+        results = check_entries(database, schema)
 
-            if isinstance(sub_dict[key], list):
+    for result in results:
+        log.log_data(format_result(result))
 
-                for item_i in range(0, len(sub_dict[key])):
+    return results
 
-                    item_string = sub_dict[key][item_i]
 
-                    if item_string:
+def decode_latex(item_string, convert):
+    '''
+    Converts the TeX character codes of a single string to Unicode
 
-                        # Find matches
-                        matches = re.findall(regex, item_string)
+    @param  item_string the string to convert
+    @param  convert     a RosettaStone used to look up encodings
+    @return             the converted string
+    '''
 
-                        # Convert matches
-                        if matches:
+    return convert.translate(item_string)
 
-                            converted_matches = []
 
-                            for match in matches:
-                                converted_matches.append(
-                                    convert.get_encoding(match))
+def normalize_string(item_string, convert):
+    '''
+    Converts TeX character codes to Unicode, then strips preservation
+    braces and backslashes from a single string
 
-                            if len(matches) == len(converted_matches):
+    @param  item_string the string to normalize
+    @param  convert     a RosettaStone used to look up encodings
+    @return             the normalized string
+    '''
 
-                                for item in range(0, len(matches)):
-                                    item_string = re.sub(
-                                        regex, converted_matches[item],
-                                        item_string, count=1)
-                    key_item_list.append(item_string)
+    # Only strings containing a backslash can hold TeX character codes
+    if item_string and '\\' in item_string:
+        item_string = decode_latex(item_string, convert)
 
-                sub_dict[key] = key_item_list
-                key_item_list = []
+    # Braces and backslashes are removed in one pass
+    return item_string.translate(STRIP_TABLE)
 
-            else:
 
-                # Extract the value associated with the key
-                item_string = sub_dict[key]
+def normalize_field(value, convert):
+    '''
+    Normalizes the value of a single BibTeX field
 
-                if item_string:
+    @param  value   the field value, either a string or a list of strings
+    @param  convert a RosettaStone used to look up encodings
+    @return         the normalized value
+    '''
 
-                    # Find matches
-                    matches = re.findall(regex, item_string)
+    if isinstance(value, list):
+        return [normalize_string(item, convert) for item in value]
 
-                    # Convert matches
-                    if matches:
+    return normalize_string(value, convert)
 
-                        converted_matches = []
 
-                        for match in matches:
-                            converted_matches.append(
-                                convert.get_encoding(match))
+def normalize_entries(database):
+    '''
+    Normalizes every field of a BibTeX database in a single pass:
+    TeX character codes are converted to Unicode, then preservation
+    braces and backslashes are stripped
 
-                        if len(matches) == len(converted_matches):
+    @param  database a BibTeX database in the form of a dictionary
+    '''
+
+    convert = map.get_rosetta()
+
+    # For each entry
+    for entry in database:
+
+        # For each key
+        for key in entry:
+            entry[key] = normalize_field(entry[key], convert)
 
-                            for item in range(0, len(matches)):
-                                item_string = re.sub(
-                                    regex, converted_matches[item],
-                                    item_string, count=1)
-                sub_dict[key] = item_string
-        database[index] = sub_dict
     return database
 
 
-def remove_brackets(database):
+def intern_value(value):
     '''
-    Strips preservation braces from a BibTeX database
+    Interns a short raw field value, or each name of a list of names, so
+    that equal values share one string
 
-    @param  database a BibTeX database in the form of a dictionary
+    @param  value the raw field value
+    @return       the interned value
+    '''
+
+    if isinstance(value, str):
+        if len(value) <= INTERN_LIMIT:
+            return sys.intern(value)
+        return value
+
+    if isinstance(value, list):
+        return [intern_value(item) for item in value]
+
+    return value
+
+
+def make_lazy(database):
     '''
+    Wraps every entry of a BibTeX database in a LazyEntry, deferring
+    normalization until a field is read
 
-    temp_dict = {}
-    temp_list = []
+    @param  database a list of raw BibTeX entries
+    @return          a list of LazyEntry objects
+    '''
 
-    # For item in database
-    for index in range(0, len(database)):
-        temp_dict = database[index]
+    return [LazyEntry(entry) for entry in database]
 
-        # For each key strip brackets
-        for key in temp_dict:
 
-            # If entry is a list
-            if isinstance(temp_dict[key], list):
+def prepare_entries(database, lazy):
+    '''
+    Normalizes the entries of a BibTeX database now or on first access
 
-                for item in temp_dict[key]:
+    @param  database a list of raw BibTeX entries
+    @param  lazy     whether to defer normalization
+    @return          a list of normalized or lazily normalized entries
+    '''
 
-                    temp_list.append(re.sub(r'[\{\}]', '', item))
+    if lazy:
+        return make_lazy(database)
 
-                temp_dict[key] = temp_list
-                temp_list = []
+    return normalize_entries(database)
 
-            else:
-                temp_dict[key] = re.sub(r'[\{\}]', '', temp_dict[key])
 
-        database[index] = temp_dict
+def project_entries(database, fields):
+    '''
+    Drops every field of a BibTeX database which is not in a given set.
+    The first field of each entry is kept as well, since some orders
+    fall back to it when an entry has no author or title.
 
-    return database
+    @param  database a list of raw or lazily normalized BibTeX entries
+    @param  fields   the set of field names to keep
+    @return          a list of the projected entries
+    '''
+
+    projected = []
+
+    for entry in database:
+
+        first = next(iter(entry), None)
+
+        if isinstance(entry, LazyEntry):
+            projected.append(entry.select(fields | set([first])))
+
+        else:
+            projected.append(dict(
+                (key, value) for key, value in entry.items()
+                if key in fields or key == first))
+
+    return projected
 
 
 def convert_to_dictionary(bib_database, log):
@@ -566,9 +557,10 @@ def convert_to_dictionary(bib_database, log):
         # Get the ID and use it as the key for the entry
         entry_key = item.get('ID')
 
-        # Sort authors if possible
-        if item.get('author'):
-            item['author'] = sorted(item['author'], key=str.swapcase)
+        # Sort and split authors if possible; lazy entries do their own
+        if not isinstance(item, LazyEntry) and item.get('author'):
+            item['author'] = names.get_names(
+                sorted(item['author'], key=str.swapcase))
 
         # If key not in new dictionary, store it
         if entry_key is not None and entry_key not in final_dict:
@@ -579,9 +571,26 @@ def convert_to_dictionary(bib_database, log):
     return final_dict
 
 
-def parse(path, log):
+def make_parser():
     '''
-    Parses a BibTeX database and returns list of BibTeX entries
+    Constructs a BibTeX parser configured for WibTeX
+
+    @return the parser
+    '''
+
+    parser = BibTexParser()
+    parser.ignore_nonstandard_types = False
+    parser.customization = customizations
+
+    # Blocks of one database may be parsed by separate calls
+    parser.expect_multiple_parse = True
+
+    return parser
+
+
+def read_entries(path, log):
+    '''
+    Reads a BibTeX database and returns its raw list of BibTeX entries
 
     @param  path a BibTeX database file path
     '''
@@ -591,29 +600,423 @@ def parse(path, log):
 
         with open(path) as bibtex_file:
 
-            parser = BibTexParser()
-            parser.ignore_nonstandard_types = False
-            parser.customization = customizations
-            bib_database = bibtexparser.load(bibtex_file, parser=parser)
-            bib_database = bib_database.entries
+            bib_database = bibtexparser.load(bibtex_file, parser=make_parser())
 
     except IOError:
 
         log.log_data("\nError: Cannot read BibTeX file or data")
+        return []
+
+    return bib_database.entries
+
+
+def split_entries(text):
+    '''
+    Splits raw BibTeX text at the start of every @type{ block; any text
+    following a block up to the next one belongs to that block
 
-    # Validate entries
-    validate_entries(bib_database, log)
+    @param  text the raw BibTeX text
+    @return      a list of (type, block) tuples with lower-case types
+    '''
 
-    # Convert characters to unicode
-    bib_database = latex_to_unicode(bib_database)
+    return [(kind, text[start:end])
+            for kind, keys, start, end in bib_index.scan_blocks(text)]
 
-    # Parse out preservation brackets
-    bib_database = remove_brackets(bib_database)
 
-    # Parse out backslashes
-    bib_database = fix_escape_chars(bib_database)
+def parse_incremental(path, log, cache, lazy=False):
+    '''
+    Parses a BibTeX database, reusing the parsed and normalized entries
+    of every block which is unchanged since the previous run. Blocks are
+    keyed by a hash of their text and of every @string definition in the
+    database, so that changing a macro parses every entry again.
+
+    @param  path  a BibTeX database file path
+    @param  cache the DiskCache holding the results of the previous run
+    @param  lazy  whether to defer normalization until a field is read
+    @return       a list of parsed and normalized BibTeX entries
+    '''
+
+    try:
+        with open(path) as bibtex_file:
+            text = bibtex_file.read()
+    except IOError:
+        log.log_data("\nError: Cannot read BibTeX file or data")
+        return []
+
+    key = cache.make_key(
+        'incremental', os.path.abspath(path), PARSER_VERSION,
+        map.get_rosetta().version, bibtexparser.__version__, lazy)
+
+    previous = cache.get(key, {})
+    current = {}
+
+    blocks = split_entries(text)
+    strings = ''.join(block for kind, block in blocks if kind == 'string')
+    context = hashlib.sha1(strings.encode('utf-8')).digest()
+
+    parser = None
+    bib_database = []
+
+    for kind, block in blocks:
+
+        if kind in bib_index.NON_ENTRY_TYPES:
+            continue
+
+        digest = hashlib.sha1(context + block.encode('utf-8')).hexdigest()
+        result = current.get(digest) or previous.get(digest)
+
+        # Parse, validate and normalize new or changed blocks only
+        if result is None:
+
+            if parser is None:
+                parser = make_parser()
+                parser.parse(strings)
+
+            count = len(parser.bib_database.entries)
+            parser.parse(block)
+            entries = parser.bib_database.entries[count:]
+
+            block_log = logger.RecordingLogger()
+            validate_entries(entries, block_log)
+
+            result = (block_log.messages, prepare_entries(entries, lazy))
+
+        current[digest] = result
+
+        messages, entries = result
+        for data_string in messages:
+            log.log_data(data_string)
+
+        bib_database.extend(entries)
+
+    # Only the blocks of this run are kept for the next one
+    cache.put(key, current)
+
+    return bib_database
+
+
+def parse_chunk(strings, text, lazy=False):
+    '''
+    Parses and normalizes a chunk of BibTeX entries; run by the workers
+    of a parallel parse
+
+    @param  strings the @string definitions of the database
+    @param  text    the raw BibTeX text of the chunk
+    @param  lazy    whether to defer normalization until a field is read
+    @return         a list of parsed and normalized BibTeX entries
+    '''
+
+    parser = make_parser()
+    parser.parse(strings)
+
+    count = len(parser.bib_database.entries)
+    parser.parse(text)
+
+    return prepare_entries(parser.bib_database.entries[count:], lazy)
+
+
+def parse_parallel(path, log, workers, lazy=False):
+    '''
+    Parses a BibTeX database across a pool of processes. The database is
+    split into chunks of whole entries, each parsed and normalized along
+    with every @string definition, and the chunks are joined back in
+    file order.
+
+    @param  path    a BibTeX database file path
+    @param  workers the number of processes to use
+    @param  lazy    whether to defer normalization until a field is read
+    @return         a list of parsed and normalized BibTeX entries
+    '''
+
+    try:
+        with open(path) as bibtex_file:
+            text = bibtex_file.read()
+    except IOError:
+        log.log_data("\nError: Cannot read BibTeX file or data")
+        return []
+
+    blocks = split_entries(text)
+    strings = ''.join(block for kind, block in blocks if kind == 'string')
+    entries = [block for kind, block in blocks
+               if kind not in bib_index.NON_ENTRY_TYPES]
+
+    # Split the entries into chunks of roughly equal length
+    target = sum(len(block) for block in entries)
+    target = target // (workers * CHUNKS_PER_WORKER) + 1
+
+    chunks = []
+    chunk = []
+    length = 0
+
+    for block in entries:
+
+        chunk.append(block)
+        length += len(block)
+
+        if length >= target:
+            chunks.append(''.join(chunk))
+            chunk = []
+            length = 0
+
+    if chunk:
+        chunks.append(''.join(chunk))
+
+    bib_database = []
+
+    with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+        for chunk_entries in executor.map(
+                parse_chunk, [strings] * len(chunks), chunks,
+                [lazy] * len(chunks)):
+            bib_database.extend(chunk_entries)
+
+    return bib_database
+
+
+def index_text(text):
+    '''
+    Indexes the blocks of raw BibTeX text by citation key
+
+    @param  text the raw BibTeX text
+    @return      a tuple of the @string definitions and a function
+                 finding the (position, raw text) blocks of a key
+    '''
+
+    blocks = bib_index.scan_blocks(text)
+    strings = ''.join(text[start:end]
+                      for kind, keys, start, end in blocks if kind == 'string')
+
+    # Map each citation key to the position of every block holding it
+    positions = {}
+    for index in range(0, len(blocks)):
+        for key in blocks[index][1]:
+            positions.setdefault(key, []).append(index)
+
+    # Cross-references are not case sensitive
+    lowered = {}
+    for key in positions:
+        lowered.setdefault(key.lower(), key)
+
+    def find_blocks(key):
+
+        if key not in positions:
+            key = lowered.get(key.lower(), key)
+
+        return [(index, text[blocks[index][2]:blocks[index][3]])
+                for index in positions.get(key, [])]
+
+    return strings, find_blocks
+
+
+def parse_selected(path, log, keys, use_index=False, lazy=False):
+    '''
+    Parses only the entries of a BibTeX database with the given keys,
+    along with the entries they cross-reference. Every other entry is
+    skipped after a raw scan for its key, or looked up in the database's
+    BibIndex without reading the rest of the file.
+
+    @param  path      a BibTeX database file path
+    @param  keys      the citation keys to parse
+    @param  use_index whether to read the database through a BibIndex
+    @param  lazy      whether to defer normalization until a field is read
+    @return           a list of parsed and normalized BibTeX entries
+    '''
+
+    index = None
+
+    try:
+        if use_index:
+            index = bib_index.BibIndex(path)
+            strings = index.get_strings()
+            find_blocks = index.find_blocks
+
+        else:
+            with open(path) as bibtex_file:
+                strings, find_blocks = index_text(bibtex_file.read())
+
+    except IOError:
+        log.log_data("\nError: Cannot read BibTeX file or data")
+        return []
+
+    parsed = {}
+    wanted = set(keys)
+
+    # Parse the wanted entries, then any cross-referenced parents
+    try:
+        while wanted:
+
+            selected = {}
+            for key in wanted:
+                for position, block in find_blocks(key):
+                    if position not in parsed:
+                        selected[position] = block
+
+            wanted = set()
+
+            for position in sorted(selected):
+
+                parsed[position] = parse_chunk(
+                    strings, selected[position], lazy)
+
+                for entry in parsed[position]:
+                    if entry.get('crossref'):
+                        wanted.add(entry['crossref'])
+
+    finally:
+        if index is not None:
+            index.close()
+
+    bib_database = []
+    for position in sorted(parsed):
+        bib_database.extend(parsed[position])
+
+    return bib_database
+
+
+def get_database_version(path, use_index=False):
+    '''
+    Identifies the normalized entries of a BibTeX database by the digest
+    of its content and the versions of everything that parses it; within
+    one version, an entry is identified by its citation key
+
+    @param  path      a BibTeX database file path
+    @param  use_index whether to take the digest kept by the database's
+                      BibIndex rather than reading the whole database
+    @return           the version, or None if the database cannot be read
+    '''
+
+    try:
+        if use_index:
+            with bib_index.BibIndex(path) as index:
+                content = index.digest
+
+        else:
+            with open(path, 'rb') as bibtex_file:
+                content = hashlib.sha1(bibtex_file.read()).hexdigest()
+
+    except IOError:
+        return None
+
+    return (content, PARSER_VERSION, map.get_rosetta().version,
+            bibtexparser.__version__)
+
+
+def get_cache_key(path, cache, keys=None, lazy=False, fields=None,
+                  use_index=False):
+    '''
+    Builds the key of a parsed BibTeX database in a cache
+
+    @param  path      a BibTeX database file path
+    @param  cache     the DiskCache the database is stored in
+    @param  keys      the citation keys parsed, or None for every entry
+    @param  lazy      whether the entries are normalized on first access
+    @param  fields    the fields kept of every entry, or None for all
+    @param  use_index whether the keys are looked up in a BibIndex, whose
+                      digest stands in for reading the whole database
+    @return           the key, or None if the database cannot be read
+    '''
+
+    version = get_database_version(path, keys is not None and use_index)
+
+    if version is None:
+        return None
+
+    if keys is not None:
+        keys = sorted(keys)
+
+    if fields is not None:
+        fields = sorted(fields)
+
+    return cache.make_key('parse', version, keys, lazy, fields)
+
+
+def parse(path, log, cache=None, incremental=False, workers=1, keys=None,
+          use_index=False, lazy=True, fields=None):
+    '''
+    Parses a BibTeX database and returns list of BibTeX entries
+
+    @param  path        a BibTeX database file path
+    @param  cache       a DiskCache holding previously parsed databases
+    @param  incremental whether to only parse the entries which changed
+                        since the previous run; requires a cache
+    @param  workers     the number of processes to parse with
+    @param  keys        the citation keys to parse, along with the
+                        entries they cross-reference; None parses all
+    @param  use_index   whether to look keys up in a BibIndex kept next
+                        to the database
+    @param  lazy        whether to normalize each field of an entry the
+                        first time it is read rather than up front
+    @param  fields      the fields to keep of every entry once it is
+                        validated, as found by style.get_style_fields;
+                        None keeps every field
+    '''
+
+    key = None
+
+    # Reuse the result of a previous run over the same content
+    if cache is not None:
+
+        key = get_cache_key(path, cache, keys, lazy, fields, use_index)
+
+        if key is not None:
+            cached = cache.get(key)
+
+            if cached is not None:
+                messages, bib_database = cached
+                for data_string in messages:
+                    log.log_data(data_string)
+                return bib_database
+
+    # Keep the messages logged by a fresh parse to replay on a cache hit
+    log = logger.RecordingLogger(log)
+
+    if keys is not None:
+
+        bib_database = parse_selected(path, log, keys, use_index, lazy)
+
+        # Validate the selected entries only
+        validate_entries(bib_database, log)
+
+        # Drop unused fields; lazy entries have not decoded them yet
+        if fields is not None:
+            bib_database = project_entries(bib_database, fields)
+
+    elif incremental and cache is not None:
+
+        # Entries are validated and normalized as they are parsed
+        bib_database = parse_incremental(path, log, cache, lazy)
+
+        if fields is not None:
+            bib_database = project_entries(bib_database, fields)
+
+    elif workers > 1:
+
+        bib_database = parse_parallel(path, log, workers, lazy)
+
+        # Validate entries once they are back in file order
+        validate_entries(bib_database, log, workers=workers)
+
+        if fields is not None:
+            bib_database = project_entries(bib_database, fields)
+
+    else:
+
+        bib_database = read_entries(path, log)
+
+        # Validate entries
+        validate_entries(bib_database, log)
+
+        # Drop unused fields before any are normalized
+        if fields is not None:
+            bib_database = project_entries(bib_database, fields)
+
+        # Convert characters to unicode, then parse out preservation
+        # brackets and backslashes, now or as each field is read
+        bib_database = prepare_entries(bib_database, lazy)
 
     # Convert to dictionary of dictionaries with access via entry key
     bib_database = convert_to_dictionary(bib_database, log)
 
+    if key is not None:
+        cache.put(key, (log.messages, bib_database))
+
     return bib_database